@@ -0,0 +1,33 @@
+"""Per-call overhead of looking up the active Babel instance.
+
+Run with ``python benchmarks/bench_binding.py``.
+"""
+from datetime import datetime
+
+from common import measure, report, setup_app
+
+app, babel = setup_app()
+
+import chalice_babel  # noqa: E402
+from chalice.test import Client  # noqa: E402
+
+
+def main():
+    d = datetime(2010, 4, 12, 13, 46)
+    with Client(app):
+        with chalice_babel.force_locale("de_DE"):
+            report("get_locale (forced)", measure(chalice_babel.get_locale))
+        report("get_locale (selector)", measure(chalice_babel.get_locale))
+        report("get_timezone", measure(chalice_babel.get_timezone))
+        report("get_domain", measure(chalice_babel.get_domain))
+        report("gettext", measure(lambda: chalice_babel.gettext("Yes")))
+        report("format_date", measure(lambda: chalice_babel.format_date(d)))
+        report(
+            "render_template_string",
+            measure(lambda: chalice_babel.render_template_string("{{ 1 }}")),
+            unit="render",
+        )
+
+
+if __name__ == "__main__":
+    main()
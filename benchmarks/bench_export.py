@@ -0,0 +1,82 @@
+"""Throughput of localized CSV exports in rows per second.
+
+Run with ``python benchmarks/bench_export.py``.
+"""
+import csv
+import io
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from common import setup_app
+
+app, babel = setup_app()
+
+import chalice_babel  # noqa: E402
+from chalice.test import Client  # noqa: E402
+from chalice_babel.export import Column, export_csv  # noqa: E402
+
+ROWS = 20000
+COLUMNS = [
+    Column("id", "ID"),
+    Column("amount", "Amount", type="number"),
+    Column("price", "Price", type="currency", currency="EUR"),
+    Column("created", "Created", type="datetime"),
+    Column("paid", "Paid", choices={True: "Yes", False: "No"}),
+]
+
+
+def rows():
+    start = datetime(2021, 1, 1)
+    for i in range(ROWS):
+        yield {
+            "id": i,
+            "amount": Decimal(i) / 7,
+            "price": i * 1.5,
+            "created": start + timedelta(minutes=i),
+            "paid": i % 2 == 0,
+        }
+
+
+def per_cell():
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([chalice_babel.gettext(column.label) for column in COLUMNS])
+    for row in rows():
+        writer.writerow(
+            [
+                str(row["id"]),
+                chalice_babel.format_decimal(row["amount"]),
+                chalice_babel.format_currency(row["price"], "EUR"),
+                chalice_babel.format_datetime(row["created"]),
+                chalice_babel.gettext("Yes" if row["paid"] else "No"),
+            ]
+        )
+    return buffer.getvalue().encode("utf-8")
+
+
+def streamed():
+    size = 0
+    for chunk in export_csv(rows(), COLUMNS):
+        size += len(chunk)
+    return size
+
+
+def throughput(func):
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return ROWS / best
+
+
+def main():
+    with Client(app):
+        for name, func in [("format per cell", per_cell), ("export_csv", streamed)]:
+            print("{:<40} {:>12.0f} rows/s".format(name, throughput(func)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Translation-heavy JSON response benchmark.
+
+Run with ``python benchmarks/bench_gettext.py``.
+"""
+import json
+
+from common import measure, report, setup_app
+
+app, babel = setup_app()
+
+import chalice_babel  # noqa: E402
+from chalice.test import Client  # noqa: E402
+
+ROWS = 200
+
+
+def translated_response():
+    items = [
+        {
+            "greeting": chalice_babel.gettext("Hello %(name)s!", name="Peter"),
+            "count": chalice_babel.ngettext("%(num)s Apple", "%(num)s Apples", i),
+            "answer": chalice_babel.gettext("Yes"),
+        }
+        for i in range(ROWS)
+    ]
+    return json.dumps(items)
+
+
+def main():
+    with Client(app):
+        report("gettext", measure(lambda: chalice_babel.gettext("Yes")))
+        report(
+            "gettext with variables",
+            measure(lambda: chalice_babel.gettext("Hello %(name)s!", name="Peter")),
+        )
+        report(
+            "ngettext",
+            measure(
+                lambda: chalice_babel.ngettext("%(num)s Apple", "%(num)s Apples", 3)
+            ),
+        )
+        report(
+            "gettext without translation",
+            measure(lambda: chalice_babel.gettext("Not translated")),
+        )
+        report(
+            "ngettext without translation",
+            measure(lambda: chalice_babel.ngettext("%(num)s Pear", "%(num)s Pears", 3)),
+        )
+        report(
+            "json response ({} rows)".format(ROWS),
+            measure(translated_response, number=50),
+            unit="response",
+        )
+
+
+if __name__ == "__main__":
+    main()
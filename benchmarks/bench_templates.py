@@ -0,0 +1,43 @@
+"""String-heavy template rendering with the shared Jinja environment and
+with per-locale environments.
+
+Run with ``python benchmarks/bench_templates.py``.
+"""
+import shutil
+import tempfile
+
+from common import build_synthetic_project, measure, report, setup_app
+
+STRINGS = 300
+
+
+def main():
+    project_dir = tempfile.mkdtemp(prefix="chalice_babel_bench_")
+    try:
+        locale = build_synthetic_project(project_dir, locales=1, strings=STRINGS)[0]
+        app, shared = setup_app(locale, project_dir=project_dir)
+
+        import chalice_babel
+        from chalice.test import Client
+
+        per_locale = chalice_babel.Babel(app, locale_environments=True)
+        per_locale.localeselector(shared.locale_selector_func)
+
+        def render():
+            return chalice_babel.render_template("bench.html", {"n": 3})
+
+        with Client(app):
+            for name, babel in [("shared", shared), ("per locale", per_locale)]:
+                with babel.activate():
+                    assert "[%s" % locale in render()
+                    report(
+                        "render {} strings ({})".format(2 * STRINGS, name),
+                        measure(render, number=100),
+                        unit="render",
+                    )
+    finally:
+        shutil.rmtree(project_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
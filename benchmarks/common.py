@@ -0,0 +1,102 @@
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TESTS_DIR = os.path.join(ROOT, "chalice_babel", "tests")
+
+SYNTHETIC_LOCALES = [
+    "de", "fr", "es", "it", "nl", "pt", "tr", "pl", "sv", "ja",
+    "ru", "cs", "da", "fi", "nb", "ko", "zh", "ar", "he", "uk",
+]
+
+
+def setup_app(locale="de_DE", project_dir=None):
+    """Make the test app importable and bind a Babel instance to it.
+
+    Translation directories and templates are resolved relative to the
+    working directory, so benchmarks run from ``chalice_babel/tests`` or
+    from ``project_dir`` when a synthetic project is used.
+    """
+    os.chdir(TESTS_DIR)
+    for path in (TESTS_DIR, ROOT):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    import chalice_babel
+    from app import app
+
+    if project_dir is not None:
+        os.chdir(project_dir)
+    babel = chalice_babel.Babel(app, default_locale=locale)
+
+    @babel.localeselector
+    def select_locale():
+        return locale
+
+    return app, babel
+
+
+def build_synthetic_project(project_dir, messages=1000, locales=5, strings=100):
+    """Write a Chalice project layout with synthetic catalogs.
+
+    Every locale gets ``messages`` singular and ``messages`` plural entries
+    in its compiled ``.mo`` file. The ``.po`` files and the ``messages.pot``
+    template only hold the singular entries because ``export_strings`` does
+    not support plurals. ``chalicelib/templates/bench.html`` uses
+    ``strings`` singular and plural messages.
+    """
+    from babel.messages.catalog import Catalog
+    from babel.messages.mofile import write_mo
+    from babel.messages.pofile import write_po
+
+    chosen = SYNTHETIC_LOCALES[:locales]
+    template = Catalog()
+    for i in range(messages):
+        template.add("Message %d" % i)
+    with open(os.path.join(project_dir, "messages.pot"), "wb") as f:
+        write_po(f, template)
+
+    for locale in chosen:
+        catalog = Catalog(locale=locale)
+        for i in range(messages):
+            catalog.add("Message %d" % i, "[%s] Message %d" % (locale, i))
+        locale_dir = os.path.join(
+            project_dir, "chalicelib", "translations", locale, "LC_MESSAGES"
+        )
+        os.makedirs(locale_dir, exist_ok=True)
+        with open(os.path.join(locale_dir, "messages.po"), "wb") as f:
+            write_po(f, catalog)
+
+        for i in range(messages):
+            catalog.add(
+                ("%%(num)s item %d" % i, "%%(num)s items %d" % i),
+                tuple(
+                    "[%s:%d] %%(num)s items %d" % (locale, form, i)
+                    for form in range(catalog.num_plurals)
+                ),
+            )
+        with open(os.path.join(locale_dir, "messages.mo"), "wb") as f:
+            write_mo(f, catalog)
+
+    templates_dir = os.path.join(project_dir, "chalicelib", "templates")
+    os.makedirs(templates_dir, exist_ok=True)
+    with open(os.path.join(templates_dir, "bench.html"), "w", encoding="utf-8") as f:
+        for i in range(strings):
+            index = i % messages
+            f.write("<p>{{ gettext('Message %d') }}</p>\n" % index)
+            f.write(
+                "<p>{{ ngettext('%%(num)s item %d', '%%(num)s items %d', n) }}</p>\n"
+                % (index, index)
+            )
+    return chosen
+
+
+def measure(func, number=1000, repeat=5):
+    """Return the best per-call time of ``func`` in seconds."""
+    timings = timeit.repeat(func, number=number, repeat=repeat)
+    return min(timings) / number
+
+
+def report(name, seconds, unit="call"):
+    print("{:<40} {:>12.2f} us/{}".format(name, seconds * 1e6, unit))
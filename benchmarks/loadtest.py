@@ -0,0 +1,336 @@
+"""Local load test of localized Chalice endpoints.
+
+Registers gettext-, formatting- and template-heavy routes on the test app
+in ``chalice_babel/tests/app.py`` and replays a mix of endpoints,
+``Accept-Language`` headers and timezones through Chalice's test client::
+
+    python benchmarks/loadtest.py --workers 4 --requests 2000
+    python benchmarks/loadtest.py --mode thread --mix gettext=1,template=3
+
+Two scenarios are reported separately. ``cold`` starts a fresh process per
+container and measures import, setup and the first request to every
+endpoint. ``warm`` sends ``--warmup`` requests per worker first and then
+reports requests per second, p50/p99 latency and the time spent per
+instrumentation phase.
+
+Workers are processes by default. Threads share Chalice's
+``app.current_request``, so the selectors may read the headers of another
+thread's request; ``--mode thread`` measures contention but not the
+correctness of the responses. Requests per second are measured over the
+measured requests of all workers only, without process start, setup and
+warmup.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from common import ROOT, TESTS_DIR
+
+ENDPOINTS = ("gettext", "format", "template")
+ACCEPT_LANGUAGES = [
+    "de-DE,de;q=0.9,en;q=0.8",
+    "tr-TR,tr;q=0.9",
+    "en-US,en;q=0.9",
+    "fr-CH, fr;q=0.9, en;q=0.8, de;q=0.7, *;q=0.5",
+    "",
+]
+TIMEZONES = ["Europe/Berlin", "Europe/Istanbul", "America/New_York", "UTC"]
+
+_state = {}
+
+
+def setup():
+    """Import the test app once per process and register the routes."""
+    if _state:
+        return _state
+    start = time.perf_counter()
+    os.chdir(TESTS_DIR)
+    for path in (TESTS_DIR, ROOT):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    import chalice_babel
+    from app import app
+    from chalice import Response
+    from chalice.test import Client
+    from chalice_babel.middleware import LocaleMiddleware
+
+    imported = time.perf_counter()
+    babel = chalice_babel.Babel(app)
+    babel.config["LANGUAGES"] = ["en", "de", "tr"]
+
+    @babel.timezoneselector
+    def select_timezone():
+        return app.current_request.headers.get("x-timezone")
+
+    app.register_middleware(LocaleMiddleware(babel), "http")
+    register_routes(app, chalice_babel, Response)
+
+    _state.update(
+        client=Client(app),
+        timings={"import": imported - start, "setup": time.perf_counter() - imported},
+    )
+    return _state
+
+
+def register_routes(app, chalice_babel, Response):
+    from datetime import datetime, timedelta
+    from decimal import Decimal
+
+    @app.route("/loadtest/gettext")
+    def loadtest_gettext():
+        gettext = chalice_babel.gettext
+        ngettext = chalice_babel.ngettext
+        return {
+            "items": [
+                {
+                    "greeting": gettext("Hello %(name)s!", name="Ada"),
+                    "apples": ngettext("%(num)s Apple", "%(num)s Apples", i),
+                    "answer": gettext("Yes"),
+                }
+                for i in range(50)
+            ]
+        }
+
+    @app.route("/loadtest/format")
+    def loadtest_format():
+        start = datetime(2021, 6, 1, 12, 0)
+        return {
+            "rows": [
+                [
+                    chalice_babel.format_decimal(Decimal(i) / 7),
+                    chalice_babel.format_currency(i * 1.5, "EUR"),
+                    chalice_babel.format_datetime(start + timedelta(hours=i)),
+                    chalice_babel.format_timedelta(timedelta(minutes=i * 7)),
+                ]
+                for i in range(25)
+            ]
+        }
+
+    @app.route("/loadtest/template")
+    def loadtest_template():
+        body = "".join(
+            chalice_babel.render_template("greeting.html", {"name": "Ada", "count": i})
+            for i in range(20)
+        )
+        return Response(body=body, headers={"Content-Type": "text/html"})
+
+
+def request(client, rng, endpoints):
+    headers = {
+        "Accept-Language": rng.choice(ACCEPT_LANGUAGES),
+        "X-Timezone": rng.choice(TIMEZONES),
+    }
+    path = "/loadtest/" + rng.choice(endpoints)
+    start = time.perf_counter()
+    response = client.http.get(path, headers=headers)
+    elapsed = time.perf_counter() - start
+    if response.status_code != 200:
+        raise RuntimeError("%s returned %d" % (path, response.status_code))
+    return elapsed
+
+
+def run_worker(seed, requests, warmup, endpoints, barrier=None):
+    """Send ``warmup`` and then ``requests`` requests from this worker.
+
+    Returns the latencies, the wall clock start and end of the measured
+    requests and the counts and durations of the instrumentation events.
+    Worker threads wait on ``barrier`` after the warmup, whose action
+    registers the Counters they share, and return no events.
+    """
+    client = setup()["client"]
+    from chalice_babel import instrumentation
+
+    rng = random.Random(seed)
+    for _ in range(warmup):
+        request(client, rng, endpoints)
+
+    # Hooks are process wide, so only worker processes register their own.
+    counters = None
+    if barrier is None:
+        counters = instrumentation.add_hook(instrumentation.Counters())
+    else:
+        barrier.wait()
+    # time.time() is comparable between processes.
+    start = time.time()
+    try:
+        latencies = [request(client, rng, endpoints) for _ in range(requests)]
+    finally:
+        end = time.time()
+        if counters is not None:
+            instrumentation.remove_hook(counters)
+    if counters is None:
+        return latencies, start, end, {}, {}
+    return latencies, start, end, counters.counts, counters.durations
+
+
+class LockedCounters(object):
+    """Counters shared by worker threads."""
+
+    def __init__(self, counters):
+        self.counters = counters
+        self.lock = threading.Lock()
+
+    def __call__(self, event, name, duration):
+        with self.lock:
+            self.counters(event, name, duration)
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def run_warm(args, endpoints):
+    shared = barrier = None
+    if args.mode == "thread":
+        setup()
+        from chalice_babel import instrumentation
+
+        shared = instrumentation.Counters()
+        hook = LockedCounters(shared)
+        barrier = threading.Barrier(
+            args.workers, action=lambda: instrumentation.add_hook(hook)
+        )
+        executor = ThreadPoolExecutor(max_workers=args.workers)
+    else:
+        executor = ProcessPoolExecutor(max_workers=args.workers)
+
+    jobs = [
+        (seed, args.requests, args.warmup, endpoints, barrier)
+        for seed in range(args.workers)
+    ]
+    try:
+        with executor:
+            results = list(executor.map(run_worker, *zip(*jobs)))
+    finally:
+        if shared is not None:
+            instrumentation.remove_hook(hook)
+
+    latencies = []
+    counts = {}
+    durations = {}
+    starts = []
+    ends = []
+    for worker_latencies, start, end, worker_counts, worker_durations in results:
+        latencies.extend(worker_latencies)
+        starts.append(start)
+        ends.append(end)
+    if shared is not None:
+        results = [(None, None, None, shared.counts, shared.durations)]
+    for _, _, _, worker_counts, worker_durations in results:
+        for (event, _), count in worker_counts.items():
+            counts[event] = counts.get(event, 0) + count
+        for (event, _), duration in worker_durations.items():
+            durations[event] = durations.get(event, 0.0) + duration
+
+    total = len(latencies)
+    wall = max(ends) - min(starts)
+    return {
+        "requests": total,
+        "requests_per_second": total / wall,
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "phases_ms_per_request": {
+            event: duration * 1000 / total for event, duration in durations.items()
+        },
+        "events_per_request": {event: count / total for event, count in counts.items()},
+    }
+
+
+def cold_container():
+    """Run in a fresh process: time setup and the first request per
+    endpoint and print them as JSON."""
+    timings = dict(setup()["timings"])
+    client = _state["client"]
+    rng = random.Random(0)
+    for endpoint in ENDPOINTS:
+        timings["first_" + endpoint] = request(client, rng, [endpoint])
+    print(json.dumps(timings))
+
+
+def run_cold(args):
+    runs = []
+    script = os.path.abspath(__file__)
+    for _ in range(args.cold_starts):
+        output = subprocess.check_output(
+            [sys.executable, script, "--cold-container"], cwd=os.path.dirname(script)
+        )
+        runs.append(json.loads(output.decode("utf-8").strip().splitlines()[-1]))
+    return {
+        key: {
+            "p50_ms": percentile([run[key] for run in runs], 0.5) * 1000,
+            "max_ms": max(run[key] for run in runs) * 1000,
+        }
+        for key in runs[0]
+    }
+
+
+def parse_mix(mix):
+    endpoints = []
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise SystemExit("unknown endpoint %r, use one of %s" % (name, ENDPOINTS))
+        endpoints.extend([name] * int(weight or 1))
+    return endpoints
+
+
+def report(results):
+    cold = results.get("cold")
+    if cold:
+        print("cold containers")
+        for key, value in cold.items():
+            line = "  {:<38} {:>10.2f} ms p50 {:>10.2f} ms max"
+            print(line.format(key, value["p50_ms"], value["max_ms"]))
+    warm = results.get("warm")
+    if warm:
+        print("warm containers ({} requests)".format(warm["requests"]))
+        print("  {:<38} {:>10.0f}".format("requests/s", warm["requests_per_second"]))
+        print("  {:<38} {:>10.2f} ms".format("p50", warm["p50_ms"]))
+        print("  {:<38} {:>10.2f} ms".format("p99", warm["p99_ms"]))
+        for event, value in sorted(warm["phases_ms_per_request"].items()):
+            print("  {:<38} {:>10.3f} ms/request".format(event, value))
+        for event, value in sorted(warm["events_per_request"].items()):
+            print("  {:<38} {:>10.2f} /request".format(event + " events", value))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--mode", choices=("process", "thread"), default="process")
+    parser.add_argument("--requests", type=int, default=1000, help="per worker")
+    parser.add_argument("--warmup", type=int, default=50, help="per worker")
+    parser.add_argument("--mix", default="gettext=1,format=1,template=1")
+    parser.add_argument("--cold-starts", type=int, default=5)
+    parser.add_argument("--scenario", choices=("all", "cold", "warm"), default="all")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--cold-container", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.cold_container:
+        cold_container()
+        return 0
+
+    endpoints = parse_mix(args.mix)
+    results = {}
+    if args.scenario in ("all", "cold"):
+        results["cold"] = run_cold(args)
+    if args.scenario in ("all", "warm"):
+        results["warm"] = run_warm(args, endpoints)
+    report(results)
+    if args.output:
+        with open(os.path.join(ROOT, args.output), "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+"""Benchmark suite for chalice_babel.
+
+Builds a synthetic Chalice project with ``--messages`` messages in
+``--locales`` locales, measures translation, formatting, templates, locale
+negotiation, export/import and cold start, and writes the results as JSON::
+
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --baseline results.json --threshold 0.2
+
+With ``--baseline`` every result is compared against a previous run and the
+script exits with status 1 when one is slower by more than ``--threshold``.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from common import ROOT, TESTS_DIR, build_synthetic_project, measure, setup_app
+
+ACCEPT_LANGUAGE = "fr-CH, fr;q=0.9, en;q=0.8, de;q=0.7, *;q=0.5"
+
+COLD_START = """
+import json, os, sys, time
+start = time.perf_counter()
+sys.path[:0] = [{tests!r}, {root!r}]
+os.chdir({tests!r})
+import chalice_babel
+imported = time.perf_counter()
+from app import app
+os.chdir({project!r})
+babel = chalice_babel.Babel(app, default_locale={locale!r})
+initialized = time.perf_counter()
+chalice_babel.gettext("Message 1")
+done = time.perf_counter()
+print(json.dumps({{
+    "import": imported - start,
+    "init": initialized - imported,
+    "first_gettext": done - initialized,
+}}))
+"""
+
+
+def bench_cold_start(project_dir, locale, repeat):
+    script = COLD_START.format(
+        tests=TESTS_DIR, root=ROOT, project=project_dir, locale=locale
+    )
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.check_output([sys.executable, "-c", script])
+        runs.append(json.loads(output.decode("utf-8").strip().splitlines()[-1]))
+    return {key: min(run[key] for run in runs) for key in runs[0]}
+
+
+def run(args):
+    results = {}
+
+    def record(name, seconds, unit="call"):
+        results[name] = {"seconds": seconds, "unit": unit}
+        print("{:<40} {:>12.2f} us/{}".format(name, seconds * 1e6, unit))
+
+    project_dir = tempfile.mkdtemp(prefix="chalice_babel_bench_")
+    try:
+        return _run(args, project_dir, record, results)
+    finally:
+        os.chdir(ROOT)
+        shutil.rmtree(project_dir, ignore_errors=True)
+
+
+def _run(args, project_dir, record, results):
+    locales = build_synthetic_project(
+        project_dir, messages=args.messages, locales=args.locales, strings=args.strings
+    )
+    locale = locales[0]
+
+    for name, seconds in bench_cold_start(project_dir, locale, args.repeat).items():
+        record("cold_start." + name, seconds, unit="process")
+
+    app, babel = setup_app(locale, project_dir=project_dir)
+    import chalice_babel
+
+    number = args.number
+    lazy = chalice_babel.lazy_gettext("Message 3")
+    record("gettext", measure(lambda: chalice_babel.gettext("Message 3"), number))
+    record(
+        "gettext.variables",
+        measure(lambda: chalice_babel.gettext("Message 3", name="x"), number),
+    )
+    record(
+        "ngettext",
+        measure(
+            lambda: chalice_babel.ngettext("%(num)s item 3", "%(num)s items 3", 5),
+            number,
+        ),
+    )
+    record(
+        "gettext.missing",
+        measure(lambda: chalice_babel.gettext("Not translated"), number),
+    )
+    record("lazy_gettext", measure(lambda: str(lazy), number))
+    msgids = ["Message %d" % i for i in range(min(args.messages, 200))]
+    record(
+        "translation.json_response",
+        measure(
+            lambda: json.dumps([chalice_babel.gettext(msgid) for msgid in msgids]),
+            max(1, number // 100),
+        ),
+        unit="response",
+    )
+
+    d = datetime(2010, 4, 12, 13, 46)
+    formatters = {
+        "format_number": lambda: chalice_babel.format_number(1099),
+        "format_decimal": lambda: chalice_babel.format_decimal(Decimal("1010.99")),
+        "format_currency": lambda: chalice_babel.format_currency(1099, "USD"),
+        "format_percent": lambda: chalice_babel.format_percent(0.19),
+        "format_scientific": lambda: chalice_babel.format_scientific(10000),
+        "format_datetime": lambda: chalice_babel.format_datetime(d),
+        "format_date": lambda: chalice_babel.format_date(d),
+        "format_time": lambda: chalice_babel.format_time(d),
+        "format_timedelta": lambda: chalice_babel.format_timedelta(timedelta(days=6)),
+    }
+    for name, func in formatters.items():
+        record(name, measure(func, number))
+    feed = [d - timedelta(seconds=i * 97) for i in range(100)]
+    record(
+        "format_timedeltas.feed",
+        measure(
+            lambda: chalice_babel.format_timedeltas(feed, now=d), max(1, number // 100)
+        ),
+        unit="100 values",
+    )
+
+    context = {"n": 3}
+    record(
+        "render_template",
+        measure(lambda: chalice_babel.render_template("bench.html", context), 50),
+        unit="render",
+    )
+    record(
+        "render_template_string",
+        measure(
+            lambda: chalice_babel.render_template_string("{{ gettext('Message 1') }}"),
+            number,
+        ),
+        unit="render",
+    )
+    record(
+        "best_match",
+        measure(lambda: babel.best_match(ACCEPT_LANGUAGE), number),
+    )
+
+    os.chdir(project_dir)
+    record(
+        "export_strings",
+        measure(
+            lambda: babel.export_strings(lang=locale, output_dir="export"),
+            number=1,
+            repeat=args.repeat,
+        ),
+        unit="run",
+    )
+    record(
+        "import_strings",
+        measure(
+            lambda: babel.import_strings(input_dir="export"),
+            number=1,
+            repeat=args.repeat,
+        ),
+        unit="run",
+    )
+    return results
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, result in sorted(results.items()):
+        previous = baseline.get("results", {}).get(name)
+        if not previous or not previous["seconds"]:
+            continue
+        ratio = result["seconds"] / previous["seconds"]
+        status = "REGRESSION" if ratio > 1 + threshold else "ok"
+        print("{:<40} {:>8.2f}x {}".format(name, ratio, status))
+        if status != "ok":
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--locales", type=int, default=5)
+    parser.add_argument("--strings", type=int, default=100)
+    parser.add_argument("--number", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    from babel import __version__ as babel_version
+
+    output = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "babel": babel_version,
+            "messages": args.messages,
+            "locales": args.locales,
+            "strings": args.strings,
+        },
+        "results": run(args),
+    }
+    if args.output:
+        with open(os.path.join(ROOT, args.output), "w", encoding="utf-8") as f:
+            json.dump(output, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(os.path.join(ROOT, args.baseline), encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(output["results"], baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,26 +1,36 @@
 import json
 import os
 import re
+import threading
+import weakref
 from contextlib import contextmanager
-from datetime import datetime
+from contextvars import ContextVar
+from datetime import datetime, timedelta
 from io import StringIO
+from time import perf_counter
 
-from functools import cached_property
+from functools import cached_property, lru_cache
+from chalice_babel.aio import locale_var, timezone_var
+from chalice_babel.cache import FragmentCacheExtension, SimpleCache, make_cache_key
+from chalice_babel.collation import get_collator
+from chalice_babel.instrumentation import emit, hooks, instrumented
 from chalice_babel.lazy_string import LazyString
+from chalice_babel.message_formatter import MessageFormatter
+from chalice_babel.missing import has_message
+from chalice_babel.parsing import get_date_parser, get_number_parser, get_time_parser
 
 from babel.messages.pofile import Catalog, read_po, write_po
 
-# TODO: Exception Fix
-try:
-    import app as current_app
-except ModuleNotFoundError:
-    pass
-
 from babel import Locale, dates, numbers, support
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 from pytz import UTC, timezone
 from werkzeug.datastructures import ImmutableDict
 
+# The Babel instance created last, unless another one is activated for the
+# current context with Babel.activate().
+_current_babel = None
+_active_babel = ContextVar("chalice_babel_babel", default=None)
+
 accept_language_re = "([A-Za-z]{1,8}(?:-[A-Za-z0-9]{1,8})*|\*)(?:\s*;\s*q=(0(?:\.[0-9]{,3})?|1(?:\.0{,3})?))?(?:\s*,\s*|$)"  # noqa: W605
 
 
@@ -55,6 +65,8 @@ class Babel(object):
         config=None,
         date_formats=None,
         configure_jinja=True,
+        template_cache=None,
+        locale_environments=False,
     ):
         self.app = app
         self._default_locale = default_locale
@@ -65,10 +77,20 @@ class Babel(object):
         self.timezone_selector_func = None
         self.config = self.config_file()
         self._configure_jinja = configure_jinja
-
+        if template_cache is None:
+            template_cache = SimpleCache()
+        self.template_cache = template_cache
+        self.locale_environments = locale_environments
+        self.locale_envs = {}
+        self._domain_lock = threading.Lock()
+
+        # The app.chalice_babel registrations are kept for code that looks
+        # them up. chalice_babel itself finds the instance through
+        # get_babel() and keeps the request locale in context variables.
         if not hasattr(app, "chalice_babel"):
             app.chalice_babel = {}
         app.chalice_babel["babel"] = self
+        self.jinja2_env = None
         if self._date_formats is None:
             self._date_formats = self.default_date_formats.copy()
 
@@ -79,10 +101,11 @@ class Babel(object):
             env = Environment(
                 loader=FileSystemLoader(os.getcwd() + "/chalicelib/templates"),
                 autoescape=select_autoescape(),
-                extensions=["jinja2.ext.i18n"],
+                extensions=["jinja2.ext.i18n", FragmentCacheExtension],
             )
-            app.chalice_babel["jinja2_env"] = env
-            app.chalice_babel["jinja2_env"].filters.update(
+            env.fragment_cache = template_cache
+            self.jinja2_env = app.chalice_babel["jinja2_env"] = env
+            env.filters.update(
                 datetimeformat=format_datetime,
                 dateformat=format_date,
                 timeformat=format_time,
@@ -93,12 +116,59 @@ class Babel(object):
                 percentformat=format_percent,
                 scientificformat=format_scientific,
             )
-            app.chalice_babel["jinja2_env"].install_gettext_callables(
+            env.install_gettext_callables(
                 lambda x: get_translations().ugettext(x),
                 lambda s, p, n: get_translations().ungettext(s, p, n),
                 newstyle=True,
             )
 
+        global _current_babel
+        _current_babel = self
+
+    def get_jinja_env(self, locale=None):
+        """Return the Jinja environment to render templates in ``locale``.
+
+        With ``locale_environments`` every locale gets an overlay of the
+        shared environment whose gettext functions are bound to the loaded
+        catalogs of that locale, so templates do not look up the locale and
+        its catalogs again for every string.
+        """
+        if not self.locale_environments:
+            return self.jinja2_env
+        if locale is None:
+            locale = get_locale()
+        key = str(locale)
+        env = self.locale_envs.get(key)
+        if env is None:
+            env = self.jinja2_env.overlay()
+            # Overlays share the globals dict and the install_* helpers of the
+            # parent, so install into a copy through the overlay's own
+            # bound i18n extension.
+            env.globals = dict(self.jinja2_env.globals)
+            i18n = env.extensions["jinja2.ext.InternationalizationExtension"]
+            i18n._install(self.domain_instance.get_translations(locale), newstyle=True)
+            self.locale_envs[key] = env
+        return env
+
+    def clear_cache(self, locale=None):
+        """Reload the catalogs of ``locale``, or of all locales, on the next
+        lookup, together with the Jinja environments bound to them."""
+        self.domain_instance.clear_cache(locale)
+        if locale is None:
+            self.locale_envs.clear()
+        else:
+            self.locale_envs.pop(str(locale), None)
+
+    @contextmanager
+    def activate(self):
+        """Make this instance the active one in the current context, e.g.
+        per tenant when several apps share a process."""
+        token = _active_babel.set(self)
+        try:
+            yield self
+        finally:
+            _active_babel.reset(token)
+
     def config_file(self):
         try:
             from chalicelib import babel_config
@@ -121,32 +191,61 @@ class Babel(object):
 
     def parse_language_header(self):
         request = self.app.current_request
-        langs = request.headers["accept-language"]
+        if request is None:
+            return ""
+        langs = request.headers.get("accept-language", "")
         return langs
 
     def best_match(self, lang_string):
-        result = []
-
-        result = []
-        pieces = re.match(f"{accept_language_re}", lang_string.lower(), re.VERBOSE)
-        request_lang = pieces.groups()[0]
-        config = self.app.chalice_babel["babel"].config
+        config = self.config
         supported_langs = config.get("LANGUAGES", self._default_locale)
-        if request_lang in supported_langs:
-            return request_lang
+        if isinstance(supported_langs, str):
+            supported_langs = [supported_langs]
+        supported = {lang.lower().replace("_", "-"): lang for lang in supported_langs}
+
+        requested = []
+        for index, (lang, quality) in enumerate(
+            re.findall(accept_language_re, (lang_string or "").lower())
+        ):
+            quality = float(quality) if quality else 1.0
+            if lang != "*" and quality > 0:
+                requested.append((-quality, index, lang))
+
+        for _, _, lang in sorted(requested):
+            if lang in supported:
+                return supported[lang]
+            primary = lang.split("-")[0]
+            if primary in supported:
+                return supported[primary]
         return self._default_locale
 
+    def select_locale(self):
+        if self.locale_selector_func is None:
+            return self.default_locale
+        rv = self.locale_selector_func()
+        if rv is None:
+            return self.default_locale
+        return Locale.parse(rv)
+
+    def select_timezone(self):
+        if self.timezone_selector_func is None:
+            return self.default_timezone
+        rv = self.timezone_selector_func()
+        if rv is None:
+            return self.default_timezone
+        return timezone(rv) if isinstance(rv, str) else rv
+
     @property
     def default_locale(self):
 
-        config = self.app.chalice_babel["babel"].config
+        config = self.config
         babel_default_locale = config.get("BABEL_DEFAULT_LOCALE", self._default_locale)
         return Locale.parse(babel_default_locale)
 
     @property
     def default_timezone(self):
 
-        config = self.app.chalice_babel["babel"].config
+        config = self.config
         babel_default_timezone = config.get(
             "BABEL_DEFAULT_TIMEZONE", self._default_timezone
         )
@@ -155,16 +254,25 @@ class Babel(object):
     @property
     def domain(self):
 
-        config = self.app.chalice_babel["babel"].config
+        config = self.config
         babel_domain = config.get("BABEL_DOMAIN", self._default_domain)
         return babel_domain
 
     @cached_property
     def domain_instance(self):
 
-        config = self.app.chalice_babel["babel"].config
-        babel_domain = config.get("BABEL_DOMAIN", self._default_domain)
-        return Domain(domain=babel_domain)
+        # cached_property does not lock on every Python version and stores
+        # the value only after the getter returns, so store it under the lock
+        # to make concurrent first calls share one Domain and its catalogs.
+        with self._domain_lock:
+            instance = self.__dict__.get("domain_instance")
+            if instance is None:
+                config = self.config
+                babel_domain = config.get("BABEL_DOMAIN", self._default_domain)
+                instance = self.__dict__["domain_instance"] = Domain(
+                    domain=babel_domain
+                )
+            return instance
 
     def list_translations(self):
 
@@ -189,7 +297,7 @@ class Babel(object):
 
     @property
     def translation_directories(self):
-        config = self.app.chalice_babel["babel"].config
+        config = self.config
         directories = config.get("BABEL_TRANSLATION_DIRECTORIES", "translations")
         for path in directories:
             if os.path.isabs(path):
@@ -284,67 +392,63 @@ class Babel(object):
             write_po(open(po_path, "wb"), new_catalog)
 
 
+def get_babel():
+    """Return the active ``Babel`` instance."""
+    babel = _active_babel.get() or _current_babel
+    if babel is None:
+        raise RuntimeError("chalice_babel.Babel has not been initialized")
+    return babel
+
+
 @contextmanager
 def force_locale(locale):
-    ctx = current_app.app.chalice_babel
-    ctx["babel_locale"] = getattr(ctx, "babel_locale", None)
-    orig_attrs = {}
-    orig_attrs["babel_locale"] = getattr(ctx, "babel_locale", None)
-
+    # The locale is set for the current context only, so concurrent tasks
+    # and threads keep their own, and it wins over an enclosing scope.
+    token = locale_var.set(Locale.parse(locale))
     try:
-        ctx["babel_locale"] = Locale.parse(locale)
-        ctx["forced_babel_locale"] = ctx["babel_locale"]
         yield
     finally:
-        if "forced_babel_locale" in ctx:
-            del ctx["forced_babel_locale"]
-
-        for key, value in orig_attrs.items():
-            ctx[key] = value
+        locale_var.reset(token)
 
 
 def get_locale():
 
-    babel = current_app.app.chalice_babel["babel"]
-    locale = current_app.app.chalice_babel.get("babel_locale", None)
+    # Timed inline rather than with @instrumented: this is the hottest call
+    # and a wrapper would add a function call even without hooks.
+    start = perf_counter() if hooks else None
+    locale = locale_var.get()
     if locale is None:
-        if babel.locale_selector_func is None:
-            locale = babel.default_locale
-        else:
-            rv = babel.locale_selector_func()
-            if rv is None:
-                locale = babel.default_locale
-            else:
-                locale = Locale.parse(rv)
+        babel = _active_babel.get() or _current_babel
+        locale = babel.select_locale()
+    if start is not None:
+        emit("get_locale", "get_locale", perf_counter() - start)
     return locale
 
 
 def get_timezone():
 
-    babel = current_app.app.chalice_babel["babel"]
-    if babel.timezone_selector_func is None:
-        tzinfo = babel.default_timezone
-    else:
-        rv = babel.timezone_selector_func()
-        if rv is None:
-            tzinfo = babel.default_timezone
-        else:
-            tzinfo = timezone(rv) if isinstance(rv, str) else rv
-    return tzinfo
+    tzinfo = timezone_var.get()
+    if tzinfo is not None:
+        return tzinfo
+    babel = _active_babel.get() or _current_babel
+    return babel.select_timezone()
 
 
+@instrumented("format")
 def format_decimal(number, format=None):
 
     locale = get_locale()
     return numbers.format_decimal(number, format=format, locale=locale)
 
 
+@instrumented("format")
 def format_number(number):
 
     locale = get_locale()
     return numbers.format_decimal(number, locale=locale)
 
 
+@instrumented("format")
 def format_currency(
     number, currency, format=None, currency_digits=True, format_type="standard"
 ):
@@ -360,25 +464,88 @@ def format_currency(
     )
 
 
+@instrumented("format")
 def format_percent(number, format=None):
 
     locale = get_locale()
     return numbers.format_percent(number, format=format, locale=locale)
 
 
+@instrumented("format")
 def format_scientific(number, format=None):
 
     locale = get_locale()
     return numbers.format_scientific(number, format=format, locale=locale)
 
 
+def parse_decimal(string, strict=False):
+
+    return get_number_parser(str(get_locale())).parse_decimal(string, strict=strict)
+
+
+def parse_number(string):
+
+    return get_number_parser(str(get_locale())).parse_number(string)
+
+
+def parse_date(string, format="medium"):
+
+    return get_date_parser(str(get_locale()), format).parse(string)
+
+
+def parse_time(string, format="medium"):
+
+    return get_time_parser(str(get_locale()), format).parse(string)
+
+
+def parse_decimal_many(values, strict=False):
+
+    parse = get_number_parser(str(get_locale())).parse_decimal
+    if strict:
+        return [parse(value, strict=True) for value in values]
+    return [parse(value) for value in values]
+
+
+def parse_number_many(values):
+
+    parse = get_number_parser(str(get_locale())).parse_number
+    return [parse(value) for value in values]
+
+
+def parse_date_many(values, format="medium"):
+
+    parse = get_date_parser(str(get_locale()), format).parse
+    return [parse(value) for value in values]
+
+
+def parse_time_many(values, format="medium"):
+
+    parse = get_time_parser(str(get_locale()), format).parse
+    return [parse(value) for value in values]
+
+
+def get_sort_key(locale=None):
+
+    if locale is None:
+        locale = get_locale()
+    return get_collator(locale).sort_key
+
+
+def sort_localized(items, key=None, reverse=False, locale=None):
+
+    sort_key = get_sort_key(locale)
+    if key is None:
+        return sorted(items, key=lambda item: sort_key(str(item)), reverse=reverse)
+    return sorted(items, key=lambda item: sort_key(str(key(item))), reverse=reverse)
+
+
 def get_translations():
 
     return get_domain().get_translations()
 
 
 def _get_format(key, format):
-    babel = current_app.app.chalice_babel["babel"]
+    babel = _active_babel.get() or _current_babel
     if format is None:
         format = babel.date_formats[key]
     if format in ("short", "medium", "full", "long"):
@@ -401,11 +568,13 @@ def to_utc(datetime):
     return datetime.astimezone(UTC).replace(tzinfo=None)
 
 
+@instrumented("format")
 def format_datetime(datetime=None, format=None, rebase=True):
     format = _get_format("datetime", format)
     return _date_format(dates.format_datetime, datetime, format, rebase)
 
 
+@instrumented("format")
 def format_date(date=None, format=None, rebase=True):
     if rebase and isinstance(date, datetime):
         date = to_user_timezone(date)
@@ -413,23 +582,91 @@ def format_date(date=None, format=None, rebase=True):
     return _date_format(dates.format_date, date, format, rebase)
 
 
+@instrumented("format")
 def format_time(time=None, format=None, rebase=True):
     format = _get_format("time", format)
     return _date_format(dates.format_time, time, format, rebase)
 
 
+@instrumented("format")
 def format_timedelta(
-    datetime_or_timedelta, granularity="second", add_direction=False, threshold=0.85
+    datetime_or_timedelta,
+    granularity="second",
+    add_direction=False,
+    threshold=0.85,
+    format="long",
 ):
 
     if isinstance(datetime_or_timedelta, datetime):
         datetime_or_timedelta = datetime.utcnow() - datetime_or_timedelta
-    return dates.format_timedelta(
+    return _format_timedelta(
+        str(get_locale()),
         datetime_or_timedelta,
         granularity,
-        threshold=threshold,
-        add_direction=add_direction,
-        locale=get_locale(),
+        add_direction,
+        threshold,
+        format,
+    )
+
+
+@instrumented("format")
+def format_timedeltas(
+    values,
+    granularity="second",
+    add_direction=False,
+    threshold=0.85,
+    format="long",
+    now=None,
+):
+    """Format many datetimes or timedeltas like ``format_timedelta()``.
+
+    Datetimes are measured against one ``now``, by default the current UTC
+    time, and the locale is looked up once.
+    """
+    locale = str(get_locale())
+    if now is None:
+        now = datetime.utcnow()
+    return [
+        _format_timedelta(
+            locale,
+            now - value if isinstance(value, datetime) else value,
+            granularity,
+            add_direction,
+            threshold,
+            format,
+        )
+        for value in values
+    ]
+
+
+def _format_timedelta(locale, delta, granularity, add_direction, threshold, format):
+    # Pick the unit and rounded count the way babel.dates.format_timedelta
+    # does, the output then only depends on a small set of keys.
+    if isinstance(delta, timedelta):
+        seconds = int(delta.days * 86400 + delta.seconds)
+    else:
+        seconds = delta
+    for unit, secs_per_unit in dates.TIMEDELTA_UNITS:
+        value = abs(seconds) / secs_per_unit
+        if value >= threshold or unit == granularity:
+            if unit == granularity and value > 0:
+                value = max(1, value)
+            value = int(round(value))
+            direction = (seconds >= 0) if add_direction else None
+            return _format_timedelta_bucket(locale, format, unit, value, direction)
+    return ""
+
+
+@lru_cache(maxsize=4096)
+def _format_timedelta_bucket(locale, format, unit, value, direction):
+    seconds = value * dict(dates.TIMEDELTA_UNITS)[unit]
+    return dates.format_timedelta(
+        seconds if direction is not False else -seconds,
+        unit,
+        threshold=float("inf"),
+        add_direction=direction is not None,
+        format=format,
+        locale=locale,
     )
 
 
@@ -442,12 +679,25 @@ def _date_format(formatter, obj, format, rebase, **extra):
 
 
 class Domain:
+    plural_forms_cache_size = 256
+    misses_cache_size = 1024
+    missing_tracker = None
+    # Every live Domain, so reports can cover the catalogs a process holds.
+    instances = weakref.WeakSet()
+
     def __init__(self, translation_directories=None, domain="messages"):
         if isinstance(translation_directories, str):
             translation_directories = [translation_directories]
         self._translation_directories = translation_directories
         self.domain = domain
         self.cache = {}
+        self.formatters = {}
+        self.misses = {}
+        self.plural_forms = {}
+        self._lock = threading.Lock()
+        self._loading = {}
+        self.overlays = weakref.WeakSet()
+        Domain.instances.add(self)
 
     def __repr__(self):
         return "<Domain({!r}, {!r})>".format(self._translation_directories, self.domain)
@@ -457,54 +707,196 @@ class Domain:
 
         if self._translation_directories is not None:
             return self._translation_directories
-        babel = current_app.app.chalice_babel["babel"]
-        return babel.translation_directories
+        return get_babel().translation_directories
 
     def get_translations_cache(self):
         return self.cache
 
-    def get_translations(self):
+    def get_translations(self, locale=None):
         cache = self.get_translations_cache()
-        locale = get_locale()
-        try:
-            return cache[str(locale), self.domain]
-        except KeyError:
-            translations = support.Translations()
+        if locale is None:
+            locale = get_locale()
+        key = str(locale), self.domain
+        translations = cache.get(key)
+        if translations is not None:
+            if hooks:
+                emit("cache_hit", "translations")
+            return translations
 
-            for dirname in self.translation_directories:
-                catalog = support.Translations.load(dirname, [locale], self.domain)
-                translations.merge(catalog)
-                if hasattr(catalog, "plural"):
-                    translations.plural = catalog.plural
+        if hooks:
+            emit("cache_miss", "translations")
+        # Single-flight: the first thread to miss loads the catalogs, the
+        # others wait for it instead of loading the same files again.
+        while True:
+            with self._lock:
+                translations = cache.get(key)
+                if translations is not None:
+                    return translations
+                loading = self._loading.get(key)
+                if loading is None:
+                    loading = self._loading[key] = threading.Event()
+                    break
+            loading.wait()
 
-            cache[str(locale), self.domain] = translations
-            return translations
+        try:
+            translations = self.load_translations(locale)
+            self.compile_formatters(key[0], translations)
+            cache[key] = translations
+        finally:
+            with self._lock:
+                del self._loading[key]
+            loading.set()
+        return translations
+
+    def load_translations(self, locale):
+        if hooks:
+            start = perf_counter()
+        translations = support.Translations()
+
+        for dirname in self.translation_directories:
+            catalog = support.Translations.load(dirname, [locale], self.domain)
+            translations.merge(catalog)
+            if hasattr(catalog, "plural"):
+                translations.plural = catalog.plural
+
+        if hooks:
+            emit("catalog_load", self.domain, perf_counter() - start)
+        return translations
+
+    def compile_formatters(self, locale, translations):
+        """Build the formatters of the singular messages in a loaded catalog.
+
+        Placeholder mismatches are therefore logged when the catalog loads.
+        Compiled ``.mo`` files do not keep the plural msgid, so plural
+        translations are checked the first time they are used.
+        """
+        for msgkey, string in translations._catalog.items():
+            if not msgkey or not isinstance(msgkey, str):
+                continue
+            context, _, msgid = msgkey.rpartition("\x04")
+            key = locale, context or None, msgid
+            if key not in self.formatters:
+                self.formatters[key] = MessageFormatter(string, (msgid,))
+
+    def clear_cache(self, locale=None):
+        """Drop the loaded catalogs of ``locale``, or of all locales, so they
+        are loaded again on the next lookup. Overlays of this domain are
+        cleared as well."""
+        cache = self.get_translations_cache()
+        if locale is None:
+            cache.clear()
+            self.formatters.clear()
+            self.misses.clear()
+            self.plural_forms.clear()
+        else:
+            locale = str(locale)
+            for key in [key for key in cache if key[0] == locale]:
+                del cache[key]
+            for key in [key for key in self.formatters if key[0] == locale]:
+                del self.formatters[key]
+            for key in [key for key in self.misses if key[0] == locale]:
+                self.misses.pop(key, None)
+            self.plural_forms.pop(locale, None)
+        for overlay in list(self.overlays):
+            overlay.clear_cache(locale)
+
+    def get_plural_form(self, locale, num):
+        try:
+            plural = self.plural_forms[locale]
+        except KeyError:
+            translations = self.get_translations(locale)
+            plural = lru_cache(maxsize=self.plural_forms_cache_size)(
+                translations.plural
+            )
+            self.plural_forms[locale] = plural
+        return plural(num)
 
     def gettext(self, string, **variables):
 
-        t = self.get_translations()
-        s = t.ugettext(string)
-        return s if not variables else s % variables
+        return self.translate(str(get_locale()), None, string, variables)
 
     def ngettext(self, singular, plural, num, **variables):
 
         variables.setdefault("num", num)
-        t = self.get_translations()
-        s = t.ungettext(singular, plural, num)
-        return s if not variables else s % variables
+        return self.translate_plural(
+            str(get_locale()), None, singular, plural, num, variables
+        )
 
     def pgettext(self, context, string, **variables):
 
-        t = self.get_translations()
-        s = t.upgettext(context, string)
-        return s if not variables else s % variables
+        return self.translate(str(get_locale()), context, string, variables)
 
     def npgettext(self, context, singular, plural, num, **variables):
 
         variables.setdefault("num", num)
-        t = self.get_translations()
-        s = t.unpgettext(context, singular, plural, num)
-        return s if not variables else s % variables
+        return self.translate_plural(
+            str(get_locale()), context, singular, plural, num, variables
+        )
+
+    def remember_miss(self, key, formatter):
+        # Strings without a translation are kept in a bounded map, oldest
+        # first out, so dynamic strings do not grow the formatter cache.
+        misses = self.misses
+        misses[key] = formatter
+        if len(misses) > self.misses_cache_size:
+            try:
+                misses.pop(next(iter(misses)), None)
+            except (StopIteration, RuntimeError):
+                pass
+
+    def translate(self, locale, context, string, variables):
+        key = locale, context, string
+        formatter = self.formatters.get(key)
+        if formatter is None:
+            formatter = self.misses.get(key)
+            if formatter is None:
+                t = self.get_translations(locale)
+                if context is None:
+                    s = t.ugettext(string)
+                    msgkey = string
+                else:
+                    s = t.upgettext(context, string)
+                    msgkey = t.CONTEXT_ENCODING % (context, string)
+                formatter = MessageFormatter(s, (string,))
+                if has_message(t, msgkey) or has_message(t, (msgkey, t.plural(1))):
+                    self.formatters[key] = formatter
+                    return formatter(variables)
+                self.remember_miss(key, formatter)
+            if self.missing_tracker is not None:
+                self.missing_tracker.record(locale, self.domain, string, context)
+        return formatter(variables)
+
+    def translate_plural(self, locale, context, singular, plural, num, variables):
+        form = self.get_plural_form(locale, num)
+        key = locale, context, singular, plural, form, num == 1
+        formatter = self.formatters.get(key)
+        if formatter is None:
+            formatter = self.misses.get(key)
+            if formatter is None:
+                t = self.get_translations(locale)
+                if context is None:
+                    s = t.ungettext(singular, plural, num)
+                    msgkey = singular
+                else:
+                    s = t.unpgettext(context, singular, plural, num)
+                    msgkey = t.CONTEXT_ENCODING % (context, singular)
+                sources = (singular, plural) if num == 1 else (plural, singular)
+                formatter = MessageFormatter(s, sources, extra=("num",))
+                if has_message(t, (msgkey, form)):
+                    self.formatters[key] = formatter
+                    return formatter(variables)
+                self.remember_miss(key, formatter)
+            if self.missing_tracker is not None:
+                self.missing_tracker.record(
+                    locale, self.domain, singular, context, plural
+                )
+        return formatter(variables)
+
+    def get_translator(self, locale=None):
+
+        if locale is None:
+            locale = get_locale()
+        return Translator(self, locale)
 
     def lazy_gettext(self, string, **variables):
 
@@ -515,10 +907,149 @@ class Domain:
         return LazyString(self.ngettext, singular, plural, num, **variables)
 
 
+class OverlayDomain(Domain):
+    """A domain holding only the messages a tenant overrides.
+
+    The catalogs of ``translation_directories`` are loaded on their own and
+    fall back to the catalogs of ``base``, which are loaded once and shared
+    by every overlay. Messages that are not overridden are translated by
+    ``base``, so its formatters are shared as well.
+    """
+
+    def __init__(self, base, translation_directories, domain=None):
+        super().__init__(translation_directories, domain=domain or base.domain)
+        self.base = base
+        base.overlays.add(self)
+
+    def __repr__(self):
+        return "<OverlayDomain({!r}, {!r})>".format(
+            self._translation_directories, self.base
+        )
+
+    def load_translations(self, locale):
+        base = self.base.get_translations(locale)
+        translations = super().load_translations(locale)
+        translations.plural = base.plural
+        translations.add_fallback(base)
+        return translations
+
+    def get_plural_form(self, locale, num):
+        return self.base.get_plural_form(locale, num)
+
+    def translate(self, locale, context, string, variables):
+        overrides = self.get_translations(locale)._catalog
+        if context is not None:
+            string_key = support.Translations.CONTEXT_ENCODING % (context, string)
+        else:
+            string_key = string
+        if string_key not in overrides:
+            return self.base.translate(locale, context, string, variables)
+        return super().translate(locale, context, string, variables)
+
+    def translate_plural(self, locale, context, singular, plural, num, variables):
+        overrides = self.get_translations(locale)._catalog
+        if context is not None:
+            string_key = support.Translations.CONTEXT_ENCODING % (context, singular)
+        else:
+            string_key = singular
+        if (string_key, 0) not in overrides:
+            return self.base.translate_plural(
+                locale, context, singular, plural, num, variables
+            )
+        return super().translate_plural(
+            locale, context, singular, plural, num, variables
+        )
+
+
+class Translator(object):
+    def __init__(self, domain, locale):
+        self.domain = domain
+        self.locale = str(locale)
+        self.lazy_functions = {
+            domain.gettext: self.gettext,
+            domain.ngettext: self.ngettext,
+            domain.pgettext: self.pgettext,
+            domain.npgettext: self.npgettext,
+        }
+
+    def __repr__(self):
+        return "<Translator({!r}, {!r})>".format(self.domain, self.locale)
+
+    def gettext(self, string, **variables):
+
+        return self.domain.translate(self.locale, None, string, variables)
+
+    def ngettext(self, singular, plural, num, **variables):
+
+        variables.setdefault("num", num)
+        return self.domain.translate_plural(
+            self.locale, None, singular, plural, num, variables
+        )
+
+    def pgettext(self, context, string, **variables):
+
+        return self.domain.translate(self.locale, context, string, variables)
+
+    def npgettext(self, context, singular, plural, num, **variables):
+
+        variables.setdefault("num", num)
+        return self.domain.translate_plural(
+            self.locale, context, singular, plural, num, variables
+        )
+
+    def resolve(self, lazy):
+
+        func = self.lazy_functions.get(lazy._func)
+        if func is None:
+            return str(lazy)
+        return func(*lazy._args, **lazy._kwargs)
+
+    def gettext_many(self, msgids, stream=False):
+
+        translate = self.domain.translate
+        locale = self.locale
+        result = (translate(locale, None, msgid, None) for msgid in msgids)
+        return result if stream else list(result)
+
+    def translate_payload(self, obj, keys=None, stream=False):
+        """Translate the strings of a nested payload of dicts and lists.
+
+        Only the values under ``keys`` are translated. Without ``keys``
+        every string is looked up as a msgid, including IDs and free text,
+        so pass ``keys`` for payloads that carry user data. With ``stream``
+        the items of a list or iterator are translated one by one as the
+        returned generator is consumed.
+        """
+        if keys is not None:
+            keys = frozenset(keys)
+        if stream:
+            if isinstance(obj, (dict, str)):
+                raise TypeError("Only lists and iterators can be streamed")
+            return (self._translate_value(item, keys, keys is None) for item in obj)
+        return self._translate_value(obj, keys, keys is None)
+
+    def _translate_value(self, obj, keys, translate):
+        if isinstance(obj, LazyString):
+            return self.resolve(obj)
+        if isinstance(obj, str):
+            if not translate:
+                return obj
+            return self.domain.translate(self.locale, None, obj, None)
+        if isinstance(obj, dict):
+            return {
+                key: self._translate_value(
+                    value, keys, translate if keys is None else key in keys
+                )
+                for key, value in obj.items()
+            }
+        if isinstance(obj, (list, tuple)):
+            return [self._translate_value(value, keys, translate) for value in obj]
+        return obj
+
+
 def get_domain():
-    babel = current_app.app.chalice_babel["babel"]
-    babel_domain = babel.domain_instance
-    return babel_domain
+    babel = _active_babel.get() or _current_babel
+    return babel.domain_instance
 
 
 def gettext(*args, **kwargs):
@@ -536,6 +1067,26 @@ def pgettext(*args, **kwargs):
     return get_domain().pgettext(*args, **kwargs)
 
 
+def get_translator(locale=None):
+    translator = get_domain().get_translator(locale)
+    translator.lazy_functions.update(
+        {
+            gettext: translator.gettext,
+            ngettext: translator.ngettext,
+            pgettext: translator.pgettext,
+        }
+    )
+    return translator
+
+
+def gettext_many(msgids, stream=False):
+    return get_translator().gettext_many(msgids, stream=stream)
+
+
+def translate_payload(obj, keys=None, stream=False):
+    return get_translator().translate_payload(obj, keys=keys, stream=stream)
+
+
 def lazy_gettext(*args, **kwargs):
     return LazyString(gettext, *args, **kwargs)
 
@@ -544,15 +1095,36 @@ def lazy_ngettext(*args, **kwargs):
     return LazyString(ngettext, *args, **kwargs)
 
 
-def render_template(template_name, context={}):
+@instrumented("render_template")
+def render_template(template_name, context={}, cache=False, timeout=None):
+
+    babel = _active_babel.get() or _current_babel
+    if babel.locale_environments or cache:
+        locale = get_locale()
+        jinja2_env = babel.get_jinja_env(locale)
+    else:
+        jinja2_env = babel.jinja2_env
+    if cache:
+        template_cache = babel.template_cache
+        key = make_cache_key(template_name, locale, get_timezone(), context)
+        rv = template_cache.get(key)
+        if rv is None:
+            if hooks:
+                emit("cache_miss", "templates")
+            template = jinja2_env.get_or_select_template(template_name)
+            rv = template.render(context)
+            template_cache.set(key, rv, timeout)
+        elif hooks:
+            emit("cache_hit", "templates")
+        return rv
 
-    jinja2_env = current_app.app.chalice_babel["jinja2_env"]
     template = jinja2_env.get_or_select_template(template_name)
     return template.render(context)
 
 
+@instrumented("render_template")
 def render_template_string(source, **context):
 
-    jinja2_env = current_app.app.chalice_babel["jinja2_env"]
+    jinja2_env = (_active_babel.get() or _current_babel).get_jinja_env()
     template = jinja2_env.from_string(source)
     return template.render(context)
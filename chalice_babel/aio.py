@@ -0,0 +1,108 @@
+import asyncio
+import contextvars
+import functools
+import inspect
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+
+from babel import Locale
+from pytz import timezone as get_timezone
+
+# Context-local overrides consulted first by ``get_locale()`` and
+# ``get_timezone()``, set by ``locale_scope()``, ``force_locale()`` and
+# ``LocaleMiddleware``.
+# Every asyncio task runs in a copy of the context, so tasks in different
+# locales do not see each other's values.
+locale_var = ContextVar("chalice_babel_locale", default=None)
+timezone_var = ContextVar("chalice_babel_timezone", default=None)
+
+
+def _get_babel(babel):
+    if babel is None:
+        import chalice_babel
+
+        babel = chalice_babel.get_babel()
+    return babel
+
+
+async def _call(func):
+    rv = func()
+    if inspect.isawaitable(rv):
+        rv = await rv
+    return rv
+
+
+async def select_locale(babel=None):
+    """Like ``Babel.select_locale()``, but the locale selector may be a
+    coroutine function."""
+    babel = _get_babel(babel)
+    if babel.locale_selector_func is None:
+        return babel.default_locale
+    rv = await _call(babel.locale_selector_func)
+    if rv is None:
+        return babel.default_locale
+    return Locale.parse(rv)
+
+
+async def select_timezone(babel=None):
+    """Like ``Babel.select_timezone()``, but the timezone selector may be a
+    coroutine function."""
+    babel = _get_babel(babel)
+    if babel.timezone_selector_func is None:
+        return babel.default_timezone
+    rv = await _call(babel.timezone_selector_func)
+    if rv is None:
+        return babel.default_timezone
+    return get_timezone(rv) if isinstance(rv, str) else rv
+
+
+async def get_translations(locale=None, domain=None, executor=None):
+    """Return the catalogs of ``locale``, loading them in ``executor`` so the
+    event loop is not blocked by file reads.
+
+    Concurrent loads of the same catalogs are shared by the single-flight
+    loading of ``Domain.get_translations``.
+    """
+    import chalice_babel
+
+    if domain is None:
+        domain = chalice_babel.get_domain()
+    if locale is None:
+        locale = chalice_babel.get_locale()
+    translations = domain.get_translations_cache().get((str(locale), domain.domain))
+    if translations is not None:
+        return translations
+    # run_in_executor does not copy the context, so run the load in a copy
+    # to keep the active Babel instance and its translation directories.
+    load = functools.partial(
+        contextvars.copy_context().run, domain.get_translations, locale
+    )
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, load)
+
+
+@asynccontextmanager
+async def locale_scope(locale=None, tzinfo=None, babel=None, executor=None):
+    """Set the locale and timezone of the current task for the block.
+
+    Without arguments they are taken from the (possibly async) selectors.
+    The catalogs of the locale are loaded in ``executor`` before entering,
+    so ``gettext()`` and friends do not block inside the block.
+    """
+    if locale is None:
+        locale = await select_locale(babel)
+    else:
+        locale = Locale.parse(locale)
+    if tzinfo is None:
+        tzinfo = await select_timezone(babel)
+    elif isinstance(tzinfo, str):
+        tzinfo = get_timezone(tzinfo)
+
+    await get_translations(locale, executor=executor)
+    locale_token = locale_var.set(locale)
+    timezone_token = timezone_var.set(tzinfo)
+    try:
+        yield locale
+    finally:
+        timezone_var.reset(timezone_token)
+        locale_var.reset(locale_token)
@@ -0,0 +1,195 @@
+import gzip
+import hashlib
+import json
+import os
+
+from babel import Locale
+from babel.plural import to_gettext
+from chalice import NotFoundError, Response
+
+
+class Bundle(object):
+    """A minified JSON catalog for one locale and domain.
+
+    ``body`` holds the UTF-8 encoded JSON, ``gzipped`` the same bytes
+    precompressed with gzip and ``etag`` a strong ETag derived from the
+    content hash. ``gzip_etag`` is the ETag of the compressed
+    representation.
+    """
+
+    __slots__ = ("locale", "domain", "body", "gzipped", "etag", "gzip_etag")
+
+    def __init__(self, locale, domain, messages):
+        self.locale = str(locale)
+        self.domain = domain
+        self.body = json.dumps(
+            messages, ensure_ascii=False, separators=(",", ":"), sort_keys=True
+        ).encode("utf-8")
+        self.gzipped = gzip.compress(self.body, compresslevel=9, mtime=0)
+        digest = hashlib.sha256(self.body).hexdigest()[:32]
+        self.etag = '"{}"'.format(digest)
+        self.gzip_etag = '"{}-gz"'.format(digest)
+
+    def __repr__(self):
+        return "<Bundle({!r}, {!r}, {})>".format(self.locale, self.domain, self.etag)
+
+
+def plural_forms(translations, locale):
+    """Return the ``Plural-Forms`` rule of a loaded catalog, or the CLDR
+    rule of ``locale`` if the catalog has none."""
+    for line in translations._catalog.get("", "").splitlines():
+        name, _, value = line.partition(":")
+        if name.strip().lower() == "plural-forms" and value.strip():
+            return value.strip()
+    return to_gettext(Locale.parse(locale).plural_form)
+
+
+def catalog_messages(translations, locale=None):
+    """Return the messages of a loaded catalog as a JSON-serializable dict.
+
+    Plural messages map the msgid to the list of plural forms. When
+    ``locale`` is given, the ``""`` key holds the language and the
+    ``Plural-Forms`` rule clients use to pick a form, like gettext
+    JSON formats do.
+    """
+    messages = {}
+    if locale is not None:
+        messages[""] = {
+            "language": str(locale),
+            "plural_forms": plural_forms(translations, locale),
+        }
+    for key, value in translations._catalog.items():
+        if isinstance(key, tuple):
+            msgid, index = key
+            forms = messages.setdefault(msgid, [])
+            forms.extend([""] * (index + 1 - len(forms)))
+            forms[index] = value
+        elif key:
+            messages[key] = value
+    return messages
+
+
+def build_bundles(babel, domains=None, output_dir=None):
+    """Build one bundle per locale and domain from the loaded catalogs.
+
+    When ``output_dir`` is given, ``<locale>/<domain>.json`` and its
+    precompressed ``.json.gz`` are written there together with a
+    ``manifest.json`` holding the ETags.
+    """
+    from chalice_babel import Domain
+
+    if domains is None:
+        domains = [babel.domain]
+    elif isinstance(domains, str):
+        domains = [domains]
+
+    bundles = {}
+    for domain in domains:
+        if domain == babel.domain:
+            domain_instance = babel.domain_instance
+        else:
+            domain_instance = Domain(domain=domain)
+        for locale in babel.list_translations():
+            translations = domain_instance.get_translations(locale)
+            messages = catalog_messages(translations, locale)
+            bundle = Bundle(locale, domain, messages)
+            bundles[bundle.locale, domain] = bundle
+
+    if output_dir is not None:
+        write_bundles(bundles, output_dir)
+    return bundles
+
+
+def write_bundles(bundles, output_dir):
+    manifest = {}
+    for (locale, domain), bundle in sorted(bundles.items()):
+        locale_dir = os.path.join(output_dir, locale)
+        os.makedirs(locale_dir, exist_ok=True)
+        path = os.path.join(locale_dir, domain + ".json")
+        with open(path, "wb") as outfile:
+            outfile.write(bundle.body)
+        with open(path + ".gz", "wb") as outfile:
+            outfile.write(bundle.gzipped)
+        manifest.setdefault(locale, {})[domain] = bundle.etag
+
+    with open(os.path.join(output_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=4, sort_keys=True)
+    return manifest
+
+
+def etag_matches(etag, if_none_match):
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate in ("*", etag):
+            return True
+    return False
+
+
+def accepts_gzip(accept_encoding):
+    """Return whether an ``Accept-Encoding`` header accepts gzip, taking
+    ``q=0`` and the ``*`` wildcard into account."""
+    qualities = {}
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
+
+def register_bundle_route(
+    app, bundles, path="/i18n/{locale}/{domain}", max_age=300, **route_kwargs
+):
+    """Serve ``bundles`` from a Chalice route with ETag revalidation.
+
+    Requests with a matching ``If-None-Match`` get a ``304``. The
+    precompressed body is sent to clients that accept gzip when
+    ``application/json`` is one of ``app.api.binary_types``, otherwise the
+    minified JSON is returned as text. Both representations have their own
+    ETag.
+    """
+
+    def serve_bundle(locale, domain):
+        bundle = bundles.get((locale, domain)) or bundles.get(
+            (locale.replace("-", "_"), domain)
+        )
+        if bundle is None:
+            raise NotFoundError("No translations for %s/%s" % (locale, domain))
+
+        request = app.current_request
+        use_gzip = "application/json" in app.api.binary_types and accepts_gzip(
+            request.headers.get("accept-encoding")
+        )
+        etag = bundle.gzip_etag if use_gzip else bundle.etag
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "public, max-age=%d" % max_age,
+            "Vary": "Accept-Encoding",
+        }
+        if etag_matches(etag, request.headers.get("if-none-match")):
+            return Response(body="", status_code=304, headers=headers)
+
+        headers["Content-Type"] = "application/json; charset=utf-8"
+        if use_gzip:
+            headers["Content-Encoding"] = "gzip"
+            return Response(body=bundle.gzipped, headers=headers)
+        return Response(body=bundle.body.decode("utf-8"), headers=headers)
+
+    app.route(path, methods=["GET"], **route_kwargs)(serve_bundle)
+    return serve_bundle
@@ -0,0 +1,165 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+
+class BaseCache(object):
+    """Interface for template output caches.
+
+    Backends store rendered strings under string keys. ``timeout`` is the
+    lifetime in seconds, ``None`` means the backend default and ``0`` means
+    the value never expires.
+    """
+
+    def __init__(self, default_timeout=300):
+        self.default_timeout = default_timeout
+
+    def _normalize_timeout(self, timeout):
+        if timeout is None:
+            timeout = self.default_timeout
+        return timeout
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, timeout=None):
+        return True
+
+    def delete(self, key):
+        return True
+
+    def clear(self):
+        return True
+
+
+class NullCache(BaseCache):
+    """A cache that never stores anything."""
+
+
+class SimpleCache(BaseCache):
+    """In-process cache with per-key expiry and LRU eviction.
+
+    At most ``threshold`` entries are kept; when the cache is full the least
+    recently used entry is evicted. Access is locked, so one cache can be
+    shared by threads.
+    """
+
+    def __init__(self, threshold=500, default_timeout=300):
+        super().__init__(default_timeout)
+        self._cache = OrderedDict()
+        self._threshold = threshold
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._cache)
+
+    def get(self, key):
+        with self._lock:
+            try:
+                expires, value = self._cache[key]
+            except KeyError:
+                return None
+            if expires and expires <= time.monotonic():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout=None):
+        timeout = self._normalize_timeout(timeout)
+        expires = time.monotonic() + timeout if timeout else 0
+        with self._lock:
+            self._cache[key] = (expires, value)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._threshold:
+                self._cache.popitem(last=False)
+        return True
+
+    def delete(self, key):
+        with self._lock:
+            return self._cache.pop(key, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+        return True
+
+
+def make_cache_key(name, locale, tzinfo, context=None):
+    """Build a cache key from a template or fragment name, the active locale
+    and timezone and a hash of the render context or vary-on values."""
+    context_hash = hashlib.sha1(
+        json.dumps(context or {}, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    return "chalice_babel:{}:{}:{}:{}".format(name, locale, tzinfo, context_hash)
+
+
+class FragmentCacheExtension(Extension):
+    """Caches the output of ``{% cache %}`` blocks per template, locale,
+    timezone and context.
+
+    ``{% cache "sidebar", 300 %}...{% endcache %}`` caches the block for
+    300 seconds under the ``"sidebar"`` key in the environment's
+    ``fragment_cache``. The key includes a hash of the render context;
+    ``{% cache "sidebar", 300, user.id, page %}`` hashes only the values
+    after the timeout instead. Loop variables are not part of the render
+    context, so fragments inside loops need to list them.
+    """
+
+    tags = {"cache"}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(fragment_cache=None)
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        name = parser.parse_expression()
+        timeout = nodes.Const(None)
+        vary_on = []
+        if parser.stream.skip_if("comma"):
+            timeout = parser.parse_expression()
+            while parser.stream.skip_if("comma"):
+                vary_on.append(parser.parse_expression())
+        args = [
+            nodes.Const(parser.name),
+            name,
+            timeout,
+            nodes.ContextReference(),
+            nodes.List(vary_on) if vary_on else nodes.Const(None),
+        ]
+        body = parser.parse_statements(["name:endcache"], drop_needle=True)
+        return nodes.CallBlock(
+            self.call_method("_cache_support", args), [], [], body
+        ).set_lineno(lineno)
+
+    def _cache_support(self, template, name, timeout, context, vary_on, caller):
+        from chalice_babel import get_locale, get_timezone
+
+        cache = self.environment.fragment_cache
+        if cache is None:
+            return caller()
+        if vary_on is None:
+            env_globals = self.environment.globals
+            vary_on = {
+                key: value
+                for key, value in context.get_all().items()
+                if key not in env_globals
+            }
+        key = make_cache_key(
+            "fragment:{}:{}".format(template, name),
+            get_locale(),
+            get_timezone(),
+            vary_on,
+        )
+        rv = cache.get(key)
+        if rv is None:
+            rv = caller()
+            cache.set(key, str(rv), timeout)
+        return Markup(rv)
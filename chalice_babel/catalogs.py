@@ -0,0 +1,136 @@
+import os
+import sys
+
+from babel.messages.mofile import write_mo
+from babel.messages.pofile import read_po
+
+
+def catalog_size(translations):
+    """Return ``(messages, bytes)`` of a loaded catalog and its fallbacks.
+
+    The size is approximated with ``sys.getsizeof`` of the message dicts,
+    keys and values, which is what the catalog adds to the process RSS.
+    """
+    messages = 0
+    size = 0
+    seen = set()
+    while translations is not None and id(translations) not in seen:
+        seen.add(id(translations))
+        catalog = getattr(translations, "_catalog", {})
+        size += sys.getsizeof(catalog)
+        for key, value in catalog.items():
+            if isinstance(key, tuple):
+                size += sys.getsizeof(key) + sum(sys.getsizeof(part) for part in key)
+            else:
+                size += sys.getsizeof(key)
+            size += sys.getsizeof(value)
+            if key and (not isinstance(key, tuple) or key[1] == 0):
+                messages += 1
+        translations = getattr(translations, "_fallback", None)
+    return messages, size
+
+
+def _live_domains(babel, domain, loaded_only):
+    from chalice_babel import Domain
+
+    if not isinstance(domain, str):
+        return [domain]
+    if domain == babel.domain:
+        return [babel.domain_instance]
+    instances = sorted(
+        (instance for instance in list(Domain.instances) if instance.domain == domain),
+        key=id,
+    )
+    if not instances and not loaded_only:
+        instances = [Domain(domain=domain)]
+    return instances
+
+
+def memory_report(babel, domains=None, loaded_only=False):
+    """Report the message count and approximate bytes per locale and domain.
+
+    ``domains`` are ``Domain`` instances or domain names. A name stands for
+    every live ``Domain`` of that name, or for the default domain of
+    ``babel``. Catalogs that are not loaded yet are loaded, unless
+    ``loaded_only`` is set, in which case only the catalogs in the
+    ``Domain`` caches are reported. Names without a live ``Domain`` are
+    then skipped; otherwise they are loaded from disk.
+    """
+    if domains is None:
+        domains = [babel.domain]
+    elif isinstance(domains, str):
+        domains = [domains]
+
+    records = []
+    for domain in domains:
+        for domain_instance in _live_domains(babel, domain, loaded_only):
+            name = domain_instance.domain
+            cache = domain_instance.get_translations_cache()
+            if loaded_only:
+                locales = sorted(locale for locale, key in cache if key == name)
+            else:
+                locales = [str(locale) for locale in babel.list_translations()]
+            for locale in locales:
+                translations = cache.get((locale, name))
+                if translations is None:
+                    translations = domain_instance.get_translations(locale)
+                messages, size = catalog_size(translations)
+                records.append(
+                    {
+                        "locale": locale,
+                        "domain": name,
+                        "messages": messages,
+                        "bytes": size,
+                    }
+                )
+    return records
+
+
+def _message_key(message):
+    msgid = message.id[0] if isinstance(message.id, (list, tuple)) else message.id
+    return msgid, message.context
+
+
+def trim_catalogs(directories, template_file, domain="messages", output_dir=None):
+    """Compile ``.mo`` files that only hold messages of ``template_file``.
+
+    Every ``<locale>/LC_MESSAGES/<domain>.po`` under ``directories`` is
+    compiled without obsolete and fuzzy entries and without messages that
+    are not in the extracted template. The ``.mo`` files are written next to
+    the ``.po`` files, or into ``output_dir`` with the same layout. Returns
+    ``{(directory, locale): (kept, dropped)}``.
+    """
+    if isinstance(directories, str):
+        directories = [directories]
+    with open(template_file, "rb") as f:
+        used = {_message_key(message) for message in read_po(f) if message.id}
+
+    result = {}
+    for dirname in directories:
+        if not os.path.isdir(dirname):
+            continue
+        for locale in sorted(os.listdir(dirname)):
+            po_file = os.path.join(dirname, locale, "LC_MESSAGES", domain + ".po")
+            if not os.path.isfile(po_file):
+                continue
+            with open(po_file, "rb") as f:
+                catalog = read_po(f, locale=locale, domain=domain)
+
+            dropped = len(catalog.obsolete)
+            catalog.obsolete.clear()
+            for message in list(catalog):
+                if not message.id:
+                    continue
+                if message.fuzzy or _message_key(message) not in used:
+                    catalog.delete(message.id, context=message.context)
+                    dropped += 1
+
+            if output_dir is None:
+                mo_dir = os.path.dirname(po_file)
+            else:
+                mo_dir = os.path.join(output_dir, locale, "LC_MESSAGES")
+                os.makedirs(mo_dir, exist_ok=True)
+            with open(os.path.join(mo_dir, domain + ".mo"), "wb") as f:
+                write_mo(f, catalog)
+            result[dirname, locale] = (len(catalog), dropped)
+    return result
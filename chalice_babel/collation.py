@@ -0,0 +1,58 @@
+import unicodedata
+
+# PyICU is optional; without it a Unicode-aware approximation is used.
+try:
+    import icu
+except ImportError:
+    icu = None
+
+
+def fallback_sort_key(text):
+    """Approximate the default Unicode collation order.
+
+    Letters compare by base letter first, then by accents and then by case
+    with lower case first. Locale specific tailorings, such as the Swedish
+    ``ä`` sorting after ``z``, need PyICU.
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    base = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return base.casefold(), decomposed.casefold(), decomposed.swapcase()
+
+
+class Collator(object):
+    """Computes and caches sort keys for one locale."""
+
+    def __init__(self, locale, cache_size=4096):
+        self.locale = str(locale)
+        self.cache_size = cache_size
+        self.cache = {}
+        if icu is not None:
+            self._sort_key = icu.Collator.createInstance(
+                icu.Locale(self.locale)
+            ).getSortKey
+        else:
+            self._sort_key = fallback_sort_key
+
+    def __repr__(self):
+        return "<Collator({!r})>".format(self.locale)
+
+    def sort_key(self, text):
+        try:
+            return self.cache[text]
+        except KeyError:
+            if len(self.cache) >= self.cache_size:
+                self.cache.clear()
+            key = self.cache[text] = self._sort_key(text)
+            return key
+
+
+collators = {}
+
+
+def get_collator(locale):
+    locale = str(locale)
+    try:
+        return collators[locale]
+    except KeyError:
+        collator = collators[locale] = Collator(locale)
+        return collator
@@ -101,6 +101,184 @@ class import_strings(Command):
         babel.import_strings(domain=self.domain, translation_folder=self.translation_folder, input_dir=self.input_dir, filename=self.filename)
 
 
+class build_bundles(Command):
+
+    description = "build per-locale JSON translation bundles for client applications"
+    user_options = [
+        ("domain=", "D", "comma separated domains of MO files"),
+        ("output_dir=", "o", "output dir"),
+    ]
+
+    def initialize_options(self):
+        self.domain = "messages"
+        self.output_dir = "i18n"
+
+    def finalize_options(self):
+        pass
+
+    def run(self):
+        from chalice_babel.bundles import build_bundles
+
+        domains = [domain.strip() for domain in self.domain.split(",") if domain.strip()]
+        bundles = build_bundles(babel, domains=domains, output_dir=self.output_dir)
+        for (locale, domain), bundle in sorted(bundles.items()):
+            print("%s/%s.json %d bytes, %d gzipped" % (locale, domain, len(bundle.body), len(bundle.gzipped)))
+
+
+class missing_report(Command):
+
+    description = "merge missing translation reports into a .pot work list"
+    user_options = [
+        ("input_files=", "i", "comma separated missing translation report files"),
+        ("domain=", "D", "only include messages of this domain"),
+        ("output_file=", "o", "name of the output .pot file"),
+    ]
+
+    def initialize_options(self):
+        self.input_files = "missing_translations.jsonl"
+        self.domain = None
+        self.output_file = "missing.pot"
+
+    def finalize_options(self):
+        if not self.input_files:
+            raise OptionError("you must specify the report files")
+
+    def run(self):
+        from chalice_babel.missing import merge_reports, write_work_list
+
+        paths = [path.strip() for path in self.input_files.split(",") if path.strip()]
+        totals = merge_reports(paths, domain=self.domain)
+        write_work_list(totals, self.output_file)
+        print("%d missing messages written to %s" % (len(totals), self.output_file))
+
+
+class extract(Command):
+
+    description = "extract messages from app.py, chalicelib and its templates"
+    user_options = [
+        ("output_file=", "o", "name of the output .pot file"),
+        ("keywords=", "k", "comma separated extra keywords to look for"),
+        ("workers=", "w", "number of extraction processes"),
+        ("cache_file=", "c", "per-file extraction cache"),
+        ("no-cache", None, "extract every file again"),
+    ]
+    boolean_options = ["no-cache"]
+
+    def initialize_options(self):
+        self.output_file = "messages.pot"
+        self.keywords = None
+        self.workers = None
+        self.cache_file = ".babel_extract_cache.json"
+        self.no_cache = False
+
+    def finalize_options(self):
+        if self.workers is not None:
+            try:
+                self.workers = int(self.workers)
+            except ValueError:
+                raise OptionError("workers must be a number")
+
+    def run(self):
+        from chalice_babel.extract import extract_messages
+
+        keywords = {}
+        for keyword in (self.keywords or "").split(","):
+            if keyword.strip():
+                keywords[keyword.strip()] = None
+        catalog, extracted, cached = extract_messages(
+            os.getcwd(),
+            output_file=self.output_file,
+            cache_file=None if self.no_cache else self.cache_file,
+            workers=self.workers,
+            keywords=keywords,
+        )
+        print("%d messages written to %s (%d files extracted, %d cached)" % (len(catalog), self.output_file, extracted, cached))
+
+
+class prerender(Command):
+
+    description = "render locale-only templates for every locale"
+    user_options = [
+        ("templates=", "t", "comma separated template names"),
+        ("output_dir=", "o", "output dir"),
+        ("workers=", "w", "number of rendering processes"),
+    ]
+
+    def initialize_options(self):
+        self.templates = None
+        self.output_dir = "chalicelib/prerendered"
+        self.workers = None
+
+    def finalize_options(self):
+        if not self.templates:
+            self.templates = ",".join(babel.config.get("BABEL_PRERENDER_TEMPLATES", ()))
+        if not self.templates:
+            raise OptionError("you must specify the templates")
+        if self.workers is not None:
+            try:
+                self.workers = int(self.workers)
+            except ValueError:
+                raise OptionError("workers must be a number")
+
+    def run(self):
+        from chalice_babel.prerender import prerender_templates
+
+        templates = [name.strip() for name in self.templates.split(",") if name.strip()]
+        manifest = prerender_templates(babel, templates, output_dir=self.output_dir, workers=self.workers)
+        for name, locales in sorted(manifest.items()):
+            print("%s: %s" % (name, ", ".join(sorted(locales))))
+
+
+class catalog_report(Command):
+
+    description = "report message counts and memory of the loaded catalogs"
+    user_options = [
+        ("domain=", "D", "comma separated domains of MO files"),
+    ]
+
+    def initialize_options(self):
+        self.domain = "messages"
+
+    def finalize_options(self):
+        pass
+
+    def run(self):
+        from chalice_babel.catalogs import memory_report
+
+        domains = [domain.strip() for domain in self.domain.split(",") if domain.strip()]
+        records = memory_report(babel, domains=domains)
+        print("%-10s %-20s %10s %12s" % ("locale", "domain", "messages", "bytes"))
+        for record in records:
+            print("%-10s %-20s %10d %12d" % (record["locale"], record["domain"], record["messages"], record["bytes"]))
+        print("%-31s %10d %12d" % ("total", sum(r["messages"] for r in records), sum(r["bytes"] for r in records)))
+
+
+class trim_catalogs(Command):
+
+    description = "compile .mo files with only the messages of the extracted template"
+    user_options = [
+        ("input_file=", "i", "extracted .pot file"),
+        ("domain=", "D", "domain of the PO files"),
+        ("output_dir=", "o", "output dir, defaults to next to the PO files"),
+    ]
+
+    def initialize_options(self):
+        self.input_file = "messages.pot"
+        self.domain = "messages"
+        self.output_dir = None
+
+    def finalize_options(self):
+        if not os.path.isfile(self.input_file):
+            raise OptionError("%s does not exist, run extract first" % self.input_file)
+
+    def run(self):
+        from chalice_babel.catalogs import trim_catalogs
+
+        result = trim_catalogs(list(babel.translation_directories), self.input_file, domain=self.domain, output_dir=self.output_dir)
+        for (dirname, locale), (kept, dropped) in sorted(result.items()):
+            print("%s: %d messages kept, %d dropped (%s)" % (locale, kept, dropped, dirname))
+
+
 class CommandLineInterface(object):
 
     usage = "%%prog %s [options] %s"
@@ -108,11 +286,23 @@ class CommandLineInterface(object):
     commands = {
         "import_strings": "import translations from json file to .po files",
         "export_strings": "exports translations to json from .po files",
+        "build_bundles": "builds per-locale json bundles for client applications",
+        "missing_report": "merges missing translation reports into a .pot file",
+        "extract": "extracts messages from the app into a .pot file",
+        "prerender": "renders locale-only templates for every locale",
+        "catalog_report": "reports message counts and memory of the catalogs",
+        "trim_catalogs": "compiles .mo files with only the extracted messages",
     }
 
     command_classes = {
         "import_strings": import_strings,
         "export_strings": export_strings,
+        "build_bundles": build_bundles,
+        "missing_report": missing_report,
+        "extract": extract,
+        "prerender": prerender,
+        "catalog_report": catalog_report,
+        "trim_catalogs": trim_catalogs,
     }
 
     def run(self, argv=None):
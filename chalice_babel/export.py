@@ -0,0 +1,244 @@
+import csv
+import json
+from datetime import datetime
+from io import StringIO
+from operator import itemgetter
+
+from babel import Locale, dates, numbers
+from pytz import UTC
+
+from chalice_babel.lazy_string import LazyString
+
+COLUMN_TYPES = ("text", "number", "currency", "percent", "date", "datetime", "time")
+
+
+class Column(object):
+    """One column of an export.
+
+    ``key`` is the dict key or sequence index of the value in a row, or a
+    callable taking the row. ``type`` is one of ``COLUMN_TYPES``;
+    ``format`` is a babel number or date pattern or one of the named date
+    formats, ``currency`` the currency code of ``currency`` columns and
+    ``choices`` maps the values of an enum column to the msgids shown
+    instead. ``label`` is translated for the header and defaults to the key.
+    """
+
+    __slots__ = ("key", "label", "type", "format", "currency", "choices")
+
+    def __init__(
+        self, key, label=None, type="text", format=None, currency=None, choices=None
+    ):
+        if type not in COLUMN_TYPES:
+            raise ValueError("Unknown column type %r" % type)
+        if type == "currency" and currency is None:
+            raise ValueError("Currency columns need a currency code")
+        self.key = key
+        self.label = label if label is not None else str(key)
+        self.type = type
+        self.format = format
+        self.currency = currency
+        self.choices = choices
+
+    def __repr__(self):
+        return "<Column({!r}, {!r})>".format(self.key, self.type)
+
+
+def _translate(translator, message):
+    if isinstance(message, LazyString):
+        return translator.resolve(message)
+    return translator.gettext(message)
+
+
+def _skip_none(func):
+    def formatter(value):
+        return None if value is None else func(value)
+
+    return formatter
+
+
+def _number_formatter(column, locale):
+    if column.type == "currency":
+        pattern = column.format or locale.currency_formats["standard"]
+    elif column.type == "percent":
+        pattern = column.format or locale.percent_formats[None]
+    else:
+        pattern = column.format or locale.decimal_formats[None]
+    if isinstance(pattern, str):
+        pattern = numbers.parse_pattern(pattern)
+
+    if column.type == "currency":
+        currency = column.currency
+        return lambda value: pattern.apply(value, locale, currency=currency)
+    return lambda value: pattern.apply(value, locale)
+
+
+def _date_formatter(column, locale, tzinfo):
+    import chalice_babel
+
+    format = chalice_babel._get_format(column.type, column.format)
+    if format not in ("full", "long", "medium", "short"):
+        pattern = dates.parse_pattern(format)
+        date_pattern = time_pattern = pattern
+        template = None
+    else:
+        date_pattern = dates.get_date_format(format, locale=locale)
+        time_pattern = dates.get_time_format(format, locale=locale)
+        template = dates.get_datetime_format(format, locale=locale).replace("'", "")
+
+    def rebase(value):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=UTC)
+        return tzinfo.normalize(value.astimezone(tzinfo))
+
+    if column.type == "date":
+
+        def formatter(value):
+            if isinstance(value, datetime):
+                value = rebase(value).date()
+            return date_pattern.apply(value, locale)
+
+    elif column.type == "time":
+
+        def formatter(value):
+            if isinstance(value, datetime):
+                value = rebase(value).timetz()
+            else:
+                value = value.replace(tzinfo=tzinfo)
+            return time_pattern.apply(value, locale)
+
+    elif template is None:
+
+        def formatter(value):
+            if not isinstance(value, datetime):
+                value = datetime.combine(value, datetime.min.time())
+            return pattern.apply(rebase(value), locale)
+
+    else:
+
+        def formatter(value):
+            if not isinstance(value, datetime):
+                value = datetime.combine(value, datetime.min.time())
+            value = rebase(value)
+            return template.replace(
+                "{0}", time_pattern.apply(value.timetz(), locale)
+            ).replace("{1}", date_pattern.apply(value.date(), locale))
+
+    return formatter
+
+
+def compile_columns(columns, locale=None, tzinfo=None):
+    """Return ``(header, getters, formatters)`` for the active or given
+    locale and timezone.
+
+    Everything that only depends on the locale, like number and date
+    patterns and translated enum labels, is looked up once here instead of
+    for every cell.
+    """
+    import chalice_babel
+
+    if locale is None:
+        locale = chalice_babel.get_locale()
+    locale = Locale.parse(locale)
+    if tzinfo is None:
+        tzinfo = chalice_babel.get_timezone()
+    translator = chalice_babel.get_translator(locale)
+
+    header = []
+    getters = []
+    formatters = []
+    for column in columns:
+        header.append(_translate(translator, column.label))
+        key = column.key
+        getters.append(key if callable(key) else itemgetter(key))
+        if column.choices is not None:
+            labels = {
+                value: _translate(translator, message)
+                for value, message in column.choices.items()
+            }
+            formatter = lambda value, labels=labels: labels.get(value, str(value))
+        elif column.type == "text":
+            formatter = str
+        elif column.type in ("number", "currency", "percent"):
+            formatter = _number_formatter(column, locale)
+        else:
+            formatter = _date_formatter(column, locale, tzinfo)
+        formatters.append(_skip_none(formatter))
+    return header, getters, formatters
+
+
+def _format_rows(rows, getters, formatters):
+    cells = list(zip(getters, formatters))
+    for row in rows:
+        yield [format(get(row)) for get, format in cells]
+
+
+def export_csv(
+    rows, columns, header=True, encoding="utf-8", chunk_size=65536, **fmtparams
+):
+    """Yield the rows as CSV in encoded chunks of about ``chunk_size`` bytes.
+
+    The locale and timezone are read when this is called, so the returned
+    generator can be consumed after the request context is gone. Only one
+    chunk is held in memory at a time.
+    """
+    labels, getters, formatters = compile_columns(columns)
+    if not header:
+        labels = None
+    return _export_csv(
+        rows, labels, getters, formatters, encoding, chunk_size, fmtparams
+    )
+
+
+def _export_csv(rows, labels, getters, formatters, encoding, chunk_size, fmtparams):
+    buffer = StringIO()
+    writer = csv.writer(buffer, **fmtparams)
+    if labels is not None:
+        writer.writerow(labels)
+    for row in _format_rows(rows, getters, formatters):
+        writer.writerow(row)
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue().encode(encoding)
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode(encoding)
+
+
+def _json_key(column):
+    # Index keys are used as strings, callable keys are named by the
+    # untranslated label, so the keys do not change with the locale.
+    key = column.key
+    if isinstance(key, str):
+        return key
+    if not callable(key):
+        return str(key)
+    label = column.label
+    if isinstance(label, LazyString) and label._args:
+        return str(label._args[0])
+    return str(label)
+
+
+def export_jsonl(rows, columns, encoding="utf-8", chunk_size=65536):
+    """Yield the rows as JSON lines in encoded chunks, one object per row
+    keyed by the column keys."""
+    _, getters, formatters = compile_columns(columns)
+    keys = [_json_key(column) for column in columns]
+    return _export_jsonl(rows, keys, getters, formatters, encoding, chunk_size)
+
+
+def _export_jsonl(rows, keys, getters, formatters, encoding, chunk_size):
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    lines = []
+    size = 0
+    for row in _format_rows(rows, getters, formatters):
+        line = dumps(dict(zip(keys, row)))
+        lines.append(line)
+        size += len(line) + 1
+        if size >= chunk_size:
+            lines.append("")
+            yield "\n".join(lines).encode(encoding)
+            lines = []
+            size = 0
+    if lines:
+        lines.append("")
+        yield "\n".join(lines).encode(encoding)
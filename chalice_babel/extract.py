@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from babel.messages.catalog import Catalog
+from babel.messages.extract import DEFAULT_KEYWORDS, extract
+from babel.messages.pofile import write_po
+
+KEYWORDS = dict(DEFAULT_KEYWORDS, lazy_gettext=None, lazy_ngettext=(1, 2))
+
+PYTHON_METHOD = "python"
+JINJA2_METHOD = "jinja2.ext:babel_extract"
+JINJA2_OPTIONS = {
+    "extensions": "jinja2.ext.i18n,chalice_babel.cache.FragmentCacheExtension",
+    "encoding": "utf-8",
+}
+TEMPLATE_EXTENSIONS = (".html", ".htm", ".txt", ".xml", ".jinja", ".jinja2", ".j2")
+SKIP_DIRS = {"__pycache__", ".chalice", "vendor", "translations", "locale"}
+
+
+def find_sources(base_dir):
+    """Yield ``(relative path, method)`` for the sources of a Chalice app.
+
+    ``app.py`` and Python files under ``chalicelib`` are extracted as Python,
+    files under ``chalicelib/templates`` as Jinja templates.
+    """
+    if os.path.isfile(os.path.join(base_dir, "app.py")):
+        yield "app.py", PYTHON_METHOD
+
+    chalicelib = os.path.join(base_dir, "chalicelib")
+    templates = os.path.join(chalicelib, "templates")
+    for dirpath, dirnames, filenames in os.walk(chalicelib):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        in_templates = dirpath == templates or dirpath.startswith(templates + os.sep)
+        for filename in sorted(filenames):
+            relpath = os.path.relpath(os.path.join(dirpath, filename), base_dir)
+            if in_templates and filename.endswith(TEMPLATE_EXTENSIONS):
+                yield relpath.replace(os.sep, "/"), JINJA2_METHOD
+            elif not in_templates and filename.endswith(".py"):
+                yield relpath.replace(os.sep, "/"), PYTHON_METHOD
+
+
+def extract_source(content, method, keywords=KEYWORDS, comment_tags=()):
+    """Extract the messages of one file as JSON-serializable lists."""
+    options = JINJA2_OPTIONS if method == JINJA2_METHOD else {}
+    messages = []
+    for lineno, message, comments, context in extract(
+        method, BytesIO(content), keywords, comment_tags, options
+    ):
+        if isinstance(message, tuple):
+            message = list(message)
+        messages.append([lineno, message, comments, context])
+    return messages
+
+
+def _extract_job(job):
+    content, method, keywords, comment_tags = job
+    return extract_source(content, method, keywords, comment_tags)
+
+
+def load_cache(cache_file, settings):
+    try:
+        with open(cache_file, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("settings") != settings:
+        return {}
+    return cache.get("files", {})
+
+
+def extract_messages(
+    base_dir=".",
+    output_file="messages.pot",
+    cache_file=".babel_extract_cache.json",
+    workers=None,
+    keywords=None,
+    comment_tags=("TRANSLATORS:",),
+    project="chalice_babel",
+):
+    """Extract messages of a Chalice app into a ``.pot`` file.
+
+    Results are cached per file keyed by the content hash, so only files
+    that changed since the last run are parsed. Changed files are parsed in
+    a process pool of ``workers`` processes; ``workers=1`` parses them in
+    this process. Returns ``(catalog, extracted, cached)`` with the number of
+    files parsed and taken from the cache.
+    """
+    keywords = dict(KEYWORDS, **(keywords or {}))
+    comment_tags = tuple(comment_tags)
+    settings = json.loads(
+        json.dumps(
+            {
+                "keywords": keywords,
+                "comment_tags": comment_tags,
+                "jinja2": JINJA2_OPTIONS,
+            }
+        )
+    )
+    if cache_file is not None:
+        cache_file = os.path.join(base_dir, cache_file)
+        cached = load_cache(cache_file, settings)
+    else:
+        cached = {}
+
+    files = {}
+    pending = []
+    for relpath, method in find_sources(base_dir):
+        with open(os.path.join(base_dir, relpath), "rb") as f:
+            content = f.read()
+        digest = hashlib.sha1(method.encode("utf-8") + b"\0" + content).hexdigest()
+        entry = cached.get(relpath)
+        if entry is not None and entry["hash"] == digest:
+            files[relpath] = entry
+        else:
+            files[relpath] = {"hash": digest, "messages": None}
+            pending.append((relpath, (content, method, keywords, comment_tags)))
+
+    jobs = [job for _, job in pending]
+    if workers == 1 or len(jobs) < 2:
+        results = [_extract_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_extract_job, jobs))
+    for (relpath, _), messages in zip(pending, results):
+        files[relpath]["messages"] = messages
+
+    catalog = Catalog(project=project, charset="utf-8", fuzzy=False)
+    for relpath in sorted(files):
+        for lineno, message, comments, context in files[relpath]["messages"]:
+            if isinstance(message, list):
+                message = tuple(message)
+            catalog.add(
+                message,
+                None,
+                [(relpath, lineno)],
+                auto_comments=comments,
+                context=context,
+            )
+
+    if output_file is not None:
+        with open(os.path.join(base_dir, output_file), "wb") as f:
+            write_po(f, catalog, width=76)
+    if cache_file is not None:
+        with open(cache_file, "w", encoding="utf-8") as f:
+            json.dump({"settings": settings, "files": files}, f, ensure_ascii=False)
+
+    return catalog, len(pending), len(files) - len(pending)
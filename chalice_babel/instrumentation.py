@@ -0,0 +1,164 @@
+import json
+import time
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+
+# Registered hooks are called as ``hook(event, name, duration)``. The list is
+# mutated in place and never rebound, so instrumented code can keep a
+# reference to it and check its truthiness before measuring anything.
+hooks = []
+
+
+def add_hook(hook):
+    if hook not in hooks:
+        hooks.append(hook)
+    return hook
+
+
+def remove_hook(hook):
+    if hook in hooks:
+        hooks.remove(hook)
+
+
+# The RequestTimings of the request handled in the current context.
+current_timings = ContextVar("chalice_babel_request_timings", default=None)
+
+
+def request_hook(event, name, duration):
+    """Forward events to the ``RequestTimings`` of the current request."""
+    timings = current_timings.get()
+    if timings is not None:
+        timings(event, name, duration)
+
+
+def emit(event, name, duration=None):
+    for hook in list(hooks):
+        hook(event, name, duration)
+
+
+def instrumented(event, name=None):
+    """Report the duration of every call of the decorated function as
+    ``event`` while hooks are registered.
+
+    Without hooks the wrapper only adds a function call, about 0.3µs. Hot
+    functions check ``hooks`` inline instead.
+    """
+
+    def decorator(func):
+        label = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not hooks:
+                return func(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                emit(event, label, perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+class Counters(object):
+    """A hook keeping call counts and total durations per (event, name)."""
+
+    def __init__(self):
+        self.counts = {}
+        self.durations = {}
+
+    def __call__(self, event, name, duration):
+        key = event, name
+        self.counts[key] = self.counts.get(key, 0) + 1
+        if duration is not None:
+            self.durations[key] = self.durations.get(key, 0.0) + duration
+
+    def reset(self):
+        self.counts.clear()
+        self.durations.clear()
+
+
+class RequestTimings(Counters):
+    """Aggregates the events of a single request per event type."""
+
+    def totals(self):
+        counts = {}
+        durations = {}
+        for (event, _), count in self.counts.items():
+            counts[event] = counts.get(event, 0) + count
+        for (event, _), duration in self.durations.items():
+            durations[event] = durations.get(event, 0.0) + duration
+        return counts, durations
+
+    def server_timing(self):
+        _, durations = self.totals()
+        return ", ".join(
+            "%s;dur=%.3f" % (event, duration * 1000)
+            for event, duration in sorted(durations.items())
+        )
+
+    def emf(self, namespace="ChaliceBabel", dimensions=None):
+        """Return a CloudWatch Embedded Metric Format record."""
+        dimensions = dict(dimensions or {})
+        counts, durations = self.totals()
+        metrics = []
+        record = dict(dimensions)
+        for event, duration in sorted(durations.items()):
+            metrics.append({"Name": event, "Unit": "Milliseconds"})
+            record[event] = round(duration * 1000, 3)
+        for event, count in sorted(counts.items()):
+            if event not in durations:
+                metrics.append({"Name": event, "Unit": "Count"})
+                record[event] = count
+        record["_aws"] = {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [
+                {
+                    "Namespace": namespace,
+                    "Dimensions": [sorted(dimensions)],
+                    "Metrics": metrics,
+                }
+            ],
+        }
+        return record
+
+
+class ServerTimingMiddleware(object):
+    """Chalice ``http`` middleware reporting the i18n time spent per request.
+
+    The response gets a ``Server-Timing`` header and ``sink`` receives one
+    Embedded Metric Format JSON line per request; printing it from Lambda
+    publishes the metrics to CloudWatch. The timings of a request are kept
+    in a context variable and ``request_hook`` stays registered, so requests
+    handled concurrently in threads are measured separately.
+    """
+
+    def __init__(self, namespace="ChaliceBabel", sink=print, dimensions=None):
+        self.namespace = namespace
+        self.sink = sink
+        self.dimensions = dimensions
+        add_hook(request_hook)
+
+    def __call__(self, event, get_response):
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        try:
+            response = get_response(event)
+        finally:
+            current_timings.reset(token)
+
+        header = timings.server_timing()
+        if header:
+            existing = response.headers.get("Server-Timing")
+            response.headers["Server-Timing"] = (
+                existing + ", " + header if existing else header
+            )
+        if self.sink is not None:
+            dimensions = self.dimensions
+            if callable(dimensions):
+                dimensions = dimensions()
+            self.sink(json.dumps(timings.emf(self.namespace, dimensions)))
+        return response
@@ -0,0 +1,63 @@
+import logging
+import re
+
+log = logging.getLogger(__name__)
+
+placeholder_re = re.compile(
+    r"%(?:\(([^)]*)\))?[#0 +-]*(?:\*|\d+)?(?:\.(?:\*|\d+))?[hlL]?([diouxXeEfFgGcrsa%])"
+)
+
+
+def parse_placeholders(string):
+    """Return the set of placeholder names used in a ``%`` format string.
+
+    Positional conversions such as ``%s`` are reported as ``None`` and
+    escaped ``%%`` sequences are ignored.
+    """
+    result = set()
+    for name, conversion in placeholder_re.findall(string):
+        if conversion == "%" and not name:
+            continue
+        result.add(name or None)
+    return frozenset(result)
+
+
+class MessageFormatter(object):
+    """A translated string analyzed once and interpolated many times.
+
+    ``sources`` are the msgids the translation was looked up with. When the
+    translation references placeholders the msgids do not provide, the
+    formatter falls back to the first source so the mismatch is reported
+    once instead of as a ``KeyError`` on every call.
+    """
+
+    __slots__ = ("string", "placeholders", "plain")
+
+    def __init__(self, string, sources=(), extra=()):
+        placeholders = parse_placeholders(string)
+        if sources and string not in sources:
+            known = set(extra)
+            for source in sources:
+                known.update(parse_placeholders(source))
+            unknown = placeholders - known
+            if unknown:
+                log.warning(
+                    "Translation %r uses placeholders %r not provided by %r, "
+                    "falling back to the source string",
+                    string,
+                    sorted(str(name) for name in unknown),
+                    sources[0],
+                )
+                string = sources[0]
+                placeholders = parse_placeholders(string)
+        self.string = string
+        self.placeholders = placeholders
+        self.plain = "%" not in string
+
+    def __repr__(self):
+        return "<MessageFormatter({!r})>".format(self.string)
+
+    def __call__(self, variables):
+        if not variables or self.plain:
+            return self.string
+        return self.string % variables
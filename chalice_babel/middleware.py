@@ -0,0 +1,57 @@
+from babel import Locale
+
+from chalice_babel.aio import locale_var, timezone_var
+
+
+class LocaleMiddleware(object):
+    """Chalice ``http`` middleware that negotiates the locale once per request.
+
+    The locale and timezone are resolved when the request starts and stored
+    in context variables, so ``get_locale()`` and ``get_timezone()`` do not
+    run the selectors again and concurrent requests keep their own values.
+    Responses get ``Content-Language`` and ``Vary: Accept-Language`` headers
+    so caches key on the negotiated language.
+
+    When no locale selector is registered the locale is negotiated from the
+    ``Accept-Language`` header against the ``LANGUAGES`` setting::
+
+        app.register_middleware(LocaleMiddleware(babel), "http")
+    """
+
+    def __init__(self, babel, set_headers=True):
+        self.babel = babel
+        self.set_headers = set_headers
+
+    def negotiate_locale(self):
+        babel = self.babel
+        if babel.locale_selector_func is not None:
+            return babel.select_locale()
+        return Locale.parse(babel.best_match(babel.parse_language_header()))
+
+    def __call__(self, event, get_response):
+        locale = self.negotiate_locale()
+        locale_token = locale_var.set(locale)
+        timezone_token = timezone_var.set(self.babel.select_timezone())
+        try:
+            response = get_response(event)
+        finally:
+            timezone_var.reset(timezone_token)
+            locale_var.reset(locale_token)
+
+        if self.set_headers:
+            add_locale_headers(response, locale)
+        return response
+
+
+def add_locale_headers(response, locale):
+    headers = response.headers
+    headers["Content-Language"] = str(locale).replace("_", "-")
+    vary = headers.get("Vary")
+    if not vary:
+        headers["Vary"] = "Accept-Language"
+    elif isinstance(vary, list):
+        if not any("accept-language" in value.lower() for value in vary):
+            headers["Vary"] = vary + ["Accept-Language"]
+    elif "accept-language" not in vary.lower():
+        headers["Vary"] = vary + ", Accept-Language"
+    return response
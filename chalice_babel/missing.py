@@ -0,0 +1,213 @@
+import heapq
+import itertools
+import json
+import logging
+import random
+import threading
+
+from babel.messages.catalog import Catalog
+from babel.messages.pofile import write_po
+
+log = logging.getLogger(__name__)
+
+
+def has_message(translations, key):
+    """Return whether ``key`` is in the catalog or one of its fallbacks."""
+    while translations is not None:
+        if key in getattr(translations, "_catalog", ()):
+            return True
+        translations = getattr(translations, "_fallback", None)
+    return False
+
+
+class FileSink(object):
+    """Appends flushed reports to a JSON lines file."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def __call__(self, records):
+        with open(self.path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class LogSink(object):
+    """Logs every flushed record as one JSON line."""
+
+    def __init__(self, logger=log, level=logging.INFO):
+        self.logger = logger
+        self.level = level
+
+    def __call__(self, records):
+        for record in records:
+            self.logger.log(self.level, json.dumps(record, ensure_ascii=False))
+
+
+class MissingTracker(object):
+    """Counts lookups of untranslated messages per (locale, domain, msgid).
+
+    Only a ``sample_rate`` fraction of misses is recorded and at most
+    ``capacity`` keys are kept. When full, the least counted key is replaced
+    and its count is inherited (the Space-Saving algorithm), so frequently
+    missed messages survive while rare ones are dropped. The least counted
+    key is found with a min-heap that is updated lazily, so recording stays
+    O(log capacity). Reported counts are scaled back by the sample rate.
+
+    Reports are sent to ``sink`` by ``flush()``. With a ``flush_interval``
+    a daemon thread calls it every ``flush_interval`` seconds, so the sink
+    never runs inside a translation lookup. ``close()`` stops the thread
+    and flushes the remaining counts.
+    """
+
+    def __init__(
+        self,
+        sink=None,
+        capacity=1000,
+        sample_rate=0.01,
+        flush_interval=60,
+        ignore_locales=(),
+    ):
+        self.sink = sink if sink is not None else LogSink()
+        self.capacity = capacity
+        self.sample_rate = sample_rate
+        self.flush_interval = flush_interval
+        self.ignore_locales = frozenset(str(locale) for locale in ignore_locales)
+        self.counts = {}
+        self._heap = []
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._flusher = None
+        if flush_interval:
+            self._flusher = threading.Thread(
+                target=self._run, name="chalice-babel-missing", daemon=True
+            )
+            self._flusher.start()
+
+    def record(self, locale, domain, msgid, context=None, plural=None):
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return
+        if locale in self.ignore_locales:
+            return
+
+        key = locale, domain, context, msgid, plural
+        with self._lock:
+            counts = self.counts
+            if key in counts:
+                counts[key] += 1
+            elif len(counts) < self.capacity:
+                counts[key] = 1
+                heapq.heappush(self._heap, (1, next(self._order), key))
+            else:
+                self._replace_min(key)
+
+    def _replace_min(self, key):
+        # Heap entries keep the count of the time they were pushed. Stale
+        # entries are refreshed when they reach the top, until the top holds
+        # the current minimum.
+        heap = self._heap
+        counts = self.counts
+        while True:
+            count, _, evicted = heap[0]
+            current = counts[evicted]
+            if current == count:
+                break
+            heapq.heapreplace(heap, (current, next(self._order), evicted))
+        del counts[evicted]
+        counts[key] = count + 1
+        heapq.heapreplace(heap, (count + 1, next(self._order), key))
+
+    def report(self):
+        scale = 1.0 / self.sample_rate if self.sample_rate < 1 else 1
+        return [
+            {
+                "locale": locale,
+                "domain": domain,
+                "context": context,
+                "msgid": msgid,
+                "msgid_plural": plural,
+                "count": int(round(count * scale)),
+            }
+            for (locale, domain, context, msgid, plural), count in sorted(
+                self.counts.items(), key=lambda item: -item[1]
+            )
+        ]
+
+    def flush(self):
+        with self._lock:
+            records = self.report()
+            self.counts = {}
+            self._heap = []
+        if records:
+            self.sink(records)
+        return records
+
+    def _run(self):
+        while not self._stopped.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                log.exception("Could not flush missing translations")
+
+    def close(self):
+        """Stop the flush thread and flush the remaining counts."""
+        self._stopped.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        return self.flush()
+
+
+def install(tracker):
+    """Track misses of every ``Domain`` with ``tracker``; ``None`` disables
+    tracking."""
+    from chalice_babel import Domain
+
+    Domain.missing_tracker = tracker
+    return tracker
+
+
+def merge_reports(paths, domain=None):
+    """Merge JSON lines reports into totals per (domain, context, msgid).
+
+    Returns ``{(domain, context, msgid, msgid_plural): {locale: count}}``.
+    """
+    totals = {}
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                if domain is not None and record["domain"] != domain:
+                    continue
+                key = (
+                    record["domain"],
+                    record.get("context"),
+                    record["msgid"],
+                    record.get("msgid_plural"),
+                )
+                locales = totals.setdefault(key, {})
+                locales[record["locale"]] = (
+                    locales.get(record["locale"], 0) + record["count"]
+                )
+    return totals
+
+
+def write_work_list(totals, output_file):
+    """Write merged misses as a ``.pot`` file, most missed messages first."""
+    catalog = Catalog(fuzzy=False)
+    for (domain, context, msgid, plural), locales in sorted(
+        totals.items(), key=lambda item: -sum(item[1].values())
+    ):
+        comment = "missing: " + ", ".join(
+            "%s (%d)" % (locale, count) for locale, count in sorted(locales.items())
+        )
+        if plural is not None:
+            msgid = (msgid, plural)
+        catalog.add(msgid, context=context, auto_comments=[comment])
+    with open(output_file, "wb") as f:
+        write_po(f, catalog, sort_output=False)
+    return catalog
@@ -0,0 +1,133 @@
+import decimal
+import re
+from datetime import date, time
+from functools import lru_cache
+
+from babel import Locale, dates, numbers
+
+ParseError = getattr(dates, "ParseError", ValueError)
+
+digits_re = re.compile(r"(\d+)")
+iso_date_re = re.compile(r"^(\d{4})-?([01]\d)-?([0-3]\d)$", flags=re.ASCII)
+
+
+def _field_order(pattern, fields):
+    """Map each field to its position among the numbers of ``pattern``.
+
+    ``fields`` maps a field name to the pattern letters that may encode it,
+    in order of preference.
+    """
+    positions = []
+    for name, letters in fields.items():
+        index = -1
+        for letter in letters:
+            index = pattern.find(letter)
+            if index >= 0:
+                break
+        positions.append((index, name))
+    positions.sort()
+    return {name: position for position, (_, name) in enumerate(positions)}
+
+
+class NumberParser(object):
+    """Parses numbers with the symbols of one locale looked up once."""
+
+    def __init__(self, locale):
+        self.locale = Locale.parse(locale)
+        self.group_symbol = numbers.get_group_symbol(self.locale)
+        self.decimal_symbol = numbers.get_decimal_symbol(self.locale)
+        self.space_group = self.group_symbol.isspace()
+
+    def parse_decimal(self, string, strict=False):
+        if strict:
+            return numbers.parse_decimal(string, locale=self.locale, strict=True)
+        group_symbol = self.group_symbol
+        if self.space_group:
+            string = string.replace(" ", group_symbol).replace("\xa0", group_symbol)
+        try:
+            return decimal.Decimal(
+                string.replace(group_symbol, "").replace(self.decimal_symbol, ".")
+            )
+        except decimal.InvalidOperation:
+            raise numbers.NumberFormatError(
+                "%r is not a valid decimal number" % string
+            )
+
+    def parse_number(self, string):
+        try:
+            return int(string.replace(self.group_symbol, ""))
+        except ValueError:
+            raise numbers.NumberFormatError("%r is not a valid number" % string)
+
+
+class DateParser(object):
+    """Parses numeric dates in the field order of one locale's pattern."""
+
+    def __init__(self, locale, format="medium"):
+        pattern = dates.get_date_format(format=format, locale=locale).pattern.lower()
+        self.order = _field_order(pattern, {"Y": "y", "M": "ml", "D": "d"})
+
+    def parse(self, string):
+        found = digits_re.findall(string)
+        if not found:
+            raise ParseError("No numbers were found in input")
+
+        iso_alike = iso_date_re.match(string)
+        if iso_alike:
+            try:
+                return date(*map(int, iso_alike.groups()))
+            except ValueError:
+                pass
+
+        order = self.order
+        year = found[order["Y"]]
+        year = 2000 + int(year) if len(year) == 2 else int(year)
+        month = int(found[order["M"]])
+        day = int(found[order["D"]])
+        if month > 12:
+            month, day = day, month
+        return date(year, month, day)
+
+
+class TimeParser(object):
+    """Parses numeric times in the field order of one locale's pattern."""
+
+    def __init__(self, locale, format="medium"):
+        pattern = dates.get_time_format(format=format, locale=locale).pattern.lower()
+        self.order = _field_order(pattern, {"H": "hk", "M": "m", "S": "s"})
+        self.has_period = "a" in pattern
+
+    def parse(self, string):
+        found = digits_re.findall(string)
+        if not found:
+            raise ParseError("No numbers were found in input")
+
+        order = self.order
+        minute = second = 0
+        hour = int(found[order["H"]])
+        if self.has_period:
+            lowered = string.lower()
+            if "pm" in lowered and hour < 12:
+                hour += 12
+            elif "am" in lowered and hour == 12:
+                hour = 0
+        if len(found) > 1:
+            minute = int(found[order["M"]])
+            if len(found) > 2:
+                second = int(found[order["S"]])
+        return time(hour, minute, second)
+
+
+@lru_cache(maxsize=None)
+def get_number_parser(locale):
+    return NumberParser(locale)
+
+
+@lru_cache(maxsize=None)
+def get_date_parser(locale, format="medium"):
+    return DateParser(locale, format)
+
+
+@lru_cache(maxsize=None)
+def get_time_parser(locale, format="medium"):
+    return TimeParser(locale, format)
@@ -0,0 +1,148 @@
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from chalice_babel.instrumentation import emit, hooks
+
+MANIFEST = "manifest.json"
+
+
+def _render_job(job):
+    import chalice_babel
+
+    template_name, locale = job
+    with chalice_babel.force_locale(locale):
+        return chalice_babel.render_template(template_name, {})
+
+
+def _hashed_name(template_name, locale, body):
+    digest = hashlib.sha256(body).hexdigest()[:16]
+    stem, ext = os.path.splitext(template_name)
+    return "{}/{}.{}{}".format(locale, stem, digest, ext), digest
+
+
+def prerender_templates(
+    babel, templates, output_dir="chalicelib/prerendered", locales=None, workers=None
+):
+    """Render ``templates`` once for every locale and write them to disk.
+
+    Only templates that depend on nothing but the locale are suited, they
+    are rendered with an empty context. Each output is written as
+    ``<locale>/<name>.<hash><ext>`` and a ``manifest.json`` maps the
+    template and locale to the file. Jobs run in a process pool of
+    ``workers`` processes forked from this one, so the pool shares the
+    configured app; ``workers=1`` renders in this process.
+    """
+    if isinstance(templates, str):
+        templates = [templates]
+    if locales is None:
+        locales = babel.list_translations()
+    jobs = [(name, str(locale)) for name in templates for locale in locales]
+
+    can_fork = "fork" in multiprocessing.get_all_start_methods()
+    if workers == 1 or len(jobs) < 2 or not can_fork:
+        results = [_render_job(job) for job in jobs]
+    else:
+        context = multiprocessing.get_context("fork")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            results = list(executor.map(_render_job, jobs))
+
+    manifest = {}
+    for (name, locale), rendered in zip(jobs, results):
+        body = rendered.encode("utf-8")
+        path, digest = _hashed_name(name, locale, body)
+        filename = os.path.join(output_dir, path)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        with open(filename, "wb") as f:
+            f.write(body)
+        manifest.setdefault(name, {})[locale] = {"path": path, "etag": '"%s"' % digest}
+
+    with open(os.path.join(output_dir, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+class PrerenderedStore(object):
+    """Looks up pre-rendered templates written by ``prerender_templates``.
+
+    The manifest is read on first use and every file is read once and kept
+    in memory.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._manifest = None
+        self._contents = {}
+
+    @property
+    def manifest(self):
+        if self._manifest is None:
+            try:
+                path = os.path.join(self.directory, MANIFEST)
+                with open(path, encoding="utf-8") as f:
+                    self._manifest = json.load(f)
+            except (OSError, ValueError):
+                self._manifest = {}
+        return self._manifest
+
+    def get(self, template_name, locale):
+        key = template_name, str(locale)
+        rv = self._contents.get(key)
+        if rv is None:
+            entry = self.manifest.get(template_name, {}).get(key[1])
+            if entry is None:
+                return None
+            path = os.path.join(self.directory, entry["path"])
+            with open(path, encoding="utf-8") as f:
+                rv = self._contents[key] = f.read()
+        return rv
+
+    def etag(self, template_name, locale):
+        entry = self.manifest.get(template_name, {}).get(str(locale))
+        return entry["etag"] if entry is not None else None
+
+    def clear(self):
+        self._manifest = None
+        self._contents.clear()
+
+
+stores = {}
+
+
+def get_store(directory=None):
+    """Return the store of ``directory``, by default the configured
+    ``BABEL_PRERENDER_DIRECTORY`` under ``chalicelib``."""
+    if directory is None:
+        import chalice_babel
+
+        babel = chalice_babel.get_babel()
+        directory = babel.config.get("BABEL_PRERENDER_DIRECTORY", "prerendered")
+        if not os.path.isabs(directory):
+            directory = os.path.join(os.getcwd() + "/chalicelib/", directory)
+    store = stores.get(directory)
+    if store is None:
+        store = stores[directory] = PrerenderedStore(directory)
+    return store
+
+
+def render_prerendered(template_name, context=None, directory=None):
+    """Return the pre-rendered output of ``template_name`` for the current
+    locale or its language, rendering it live when it was not pre-rendered
+    or a ``context`` is given."""
+    import chalice_babel
+
+    if not context:
+        store = get_store(directory)
+        locale = chalice_babel.get_locale()
+        rv = store.get(template_name, locale)
+        if rv is None and locale.territory:
+            rv = store.get(template_name, locale.language)
+        if rv is not None:
+            if hooks:
+                emit("cache_hit", "prerendered")
+            return rv
+    if hooks:
+        emit("cache_miss", "prerendered")
+    return chalice_babel.render_template(template_name, context or {})
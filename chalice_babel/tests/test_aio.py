@@ -0,0 +1,128 @@
+import asyncio
+import random
+
+import chalice_babel as babel
+from chalice_babel import aio
+
+from app import app
+from babel.messages.catalog import Catalog
+from babel.messages.mofile import write_mo
+from chalice import Chalice
+from chalice.test import Client
+
+EXPECTED = {"de": "Ja", "tr": "Evet", "en": "Yes"}
+
+
+def test_concurrent_tasks_keep_their_locale():
+    b = babel.Babel(app, default_locale="en")
+
+    async def task(locale, tzinfo):
+        async with aio.locale_scope(locale, tzinfo):
+            for _ in range(5):
+                await asyncio.sleep(random.random() / 1000)
+                assert str(babel.get_locale()) == locale
+                assert str(babel.get_timezone()) == tzinfo
+                assert babel.gettext("Yes") == EXPECTED[locale]
+        return babel.gettext("Yes")
+
+    async def main():
+        jobs = [
+            task(locale, tzinfo)
+            for locale, tzinfo in [("de", "Europe/Berlin"), ("tr", "Europe/Istanbul")]
+            * 50
+        ]
+        jobs += [task("en", "UTC") for _ in range(20)]
+        return await asyncio.gather(*jobs)
+
+    with Client(app) as client:
+        with babel.force_locale("de_DE"):
+            results = asyncio.run(main())
+            assert babel.gettext("Yes") == "Ja"
+    # outside the scopes every task saw the forced locale again
+    assert set(results) == {"Ja"}
+
+
+def test_async_selectors():
+    b = babel.Babel(app)
+
+    @b.localeselector
+    async def select_locale():
+        await asyncio.sleep(0)
+        return "tr"
+
+    @b.timezoneselector
+    async def select_timezone():
+        return "Europe/Istanbul"
+
+    async def main():
+        async with aio.locale_scope() as locale:
+            assert str(locale) == "tr"
+            assert str(babel.get_timezone()) == "Europe/Istanbul"
+            return babel.gettext("Yes")
+
+    with Client(app) as client:
+        assert asyncio.run(main()) == "Evet"
+
+
+def test_get_translations_in_executor(mocker):
+    b = babel.Babel(app)
+    domain = babel.Domain(domain="messages")
+    load = mocker.spy(domain, "load_translations")
+
+    async def main():
+        return await asyncio.gather(
+            *[aio.get_translations("de", domain=domain) for _ in range(10)]
+        )
+
+    with Client(app) as client:
+        results = asyncio.run(main())
+        assert {id(translations) for translations in results} == {
+            id(domain.get_translations("de"))
+        }
+        assert results[0].ugettext("Yes") == "Ja"
+    assert load.call_count == 1
+
+
+def test_force_locale_inside_scope():
+    b = babel.Babel(app)
+
+    async def task(locale, forced):
+        async with aio.locale_scope(locale):
+            with babel.force_locale(forced):
+                await asyncio.sleep(random.random() / 1000)
+                assert str(babel.get_locale()) == forced
+                answer = babel.gettext("Yes")
+            assert str(babel.get_locale()) == locale
+        return answer
+
+    async def main():
+        pairs = [("de", "tr"), ("tr", "de")] * 20
+        return await asyncio.gather(*[task(locale, forced) for locale, forced in pairs])
+
+    with Client(app) as client:
+        assert asyncio.run(main()) == ["Evet", "Ja"] * 20
+
+
+def test_scope_loads_catalogs_of_active_babel(tmpdir):
+    catalog = Catalog(locale="de")
+    catalog.add("Yes", "Jawohl (tenant)")
+    mo_dir = tmpdir.mkdir("de").mkdir("LC_MESSAGES")
+    with open(str(mo_dir.join("messages.mo")), "wb") as f:
+        write_mo(f, catalog)
+    tenant = babel.Babel(Chalice(app_name="tenant"))
+    tenant.config = dict(
+        tenant.config, BABEL_TRANSLATION_DIRECTORIES=[str(tmpdir)]
+    )
+    b = babel.Babel(app)
+
+    async def main():
+        async with aio.locale_scope("de"):
+            return babel.gettext("Yes")
+
+    with Client(app) as client:
+        with tenant.activate():
+            assert asyncio.run(main()) == "Jawohl (tenant)"
+        with babel.force_locale("de"):
+            with tenant.activate():
+                assert babel.gettext("Yes") == "Jawohl (tenant)"
+            assert babel.gettext("Yes") == "Ja"
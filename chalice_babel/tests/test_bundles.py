@@ -0,0 +1,113 @@
+import gzip
+import json
+import os
+
+import chalice_babel as babel
+import pytest
+from chalice import Chalice
+from chalice_babel.bundles import (
+    accepts_gzip,
+    build_bundles,
+    etag_matches,
+    register_bundle_route,
+)
+
+from chalice.test import Client
+
+
+@pytest.fixture
+def bundle_app():
+    # A separate app, so the route and the Babel instance do not leak into
+    # the other test modules that share ``app``.
+    bundle_app = Chalice(app_name="chalice_babel_bundles_test")
+    babel.Babel(bundle_app)
+    return bundle_app
+
+
+@pytest.fixture
+def bundles(bundle_app):
+    bundles = build_bundles(bundle_app.chalice_babel["babel"])
+    register_bundle_route(bundle_app, bundles)
+    return bundles
+
+
+def test_build_bundles(tmpdir, bundle_app):
+    b = bundle_app.chalice_babel["babel"]
+    bundles = build_bundles(b, output_dir=str(tmpdir))
+    assert set(bundles) == {("de", "messages"), ("tr", "messages")}
+
+    bundle = bundles["de", "messages"]
+    messages = json.loads(bundle.body)
+    assert messages["Yes"] == "Ja"
+    assert messages["%(num)s Apple"] == ["%(num)s Apfel", "%(num)s Äpfel"]
+    assert messages[""] == {
+        "language": "de",
+        "plural_forms": "nplurals=2; plural=(n != 1)",
+    }
+    assert b'": "' not in bundle.body
+    assert gzip.decompress(bundle.gzipped) == bundle.body
+    assert build_bundles(b)["de", "messages"].etag == bundle.etag
+
+    with open(os.path.join(str(tmpdir), "de", "messages.json"), "rb") as f:
+        assert f.read() == bundle.body
+    with open(os.path.join(str(tmpdir), "manifest.json")) as f:
+        assert json.load(f)["de"]["messages"] == bundle.etag
+
+
+def test_etag_matches():
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('"abc"', 'W/"xyz", W/"abc"')
+    assert etag_matches('"abc"', "*")
+    assert not etag_matches('"abc"', '"xyz"')
+    assert not etag_matches('"abc"', None)
+
+
+def test_accepts_gzip():
+    assert accepts_gzip("gzip")
+    assert accepts_gzip("deflate, gzip;q=0.5")
+    assert accepts_gzip("br, *")
+    assert not accepts_gzip("gzip;q=0")
+    assert not accepts_gzip("gzip; q=0.0, *")
+    assert not accepts_gzip("*;q=0")
+    assert not accepts_gzip("deflate")
+    assert not accepts_gzip(None)
+
+
+def test_bundle_route(bundle_app, bundles):
+    bundle = bundles["tr", "messages"]
+
+    with Client(bundle_app) as client:
+        response = client.http.get("/i18n/tr/messages")
+        assert response.status_code == 200
+        assert response.headers["ETag"] == bundle.etag
+        assert json.loads(response.body)["Yes"] == "Evet"
+
+        response = client.http.get(
+            "/i18n/tr/messages", headers={"If-None-Match": bundle.etag}
+        )
+        assert response.status_code == 304
+        assert response.body == b""
+
+        assert client.http.get("/i18n/fr/messages").status_code == 404
+
+
+def test_bundle_route_gzip(bundle_app, bundles):
+    bundle_app.api.binary_types.append("application/json")
+    headers = {"Accept": "application/json", "Accept-Encoding": "gzip"}
+    with Client(bundle_app) as client:
+        response = client.http.get("/i18n/de/messages", headers=headers)
+        bundle = bundles["de", "messages"]
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["ETag"] == bundle.gzip_etag != bundle.etag
+        assert gzip.decompress(response.body) == bundle.body
+
+        response = client.http.get(
+            "/i18n/de/messages",
+            headers=dict(headers, **{"If-None-Match": bundle.etag}),
+        )
+        assert response.status_code == 200
+
+        headers["Accept-Encoding"] = "gzip;q=0"
+        response = client.http.get("/i18n/de/messages", headers=headers)
+        assert "Content-Encoding" not in response.headers
+        assert response.headers["ETag"] == bundle.etag
@@ -0,0 +1,83 @@
+import os
+
+from babel.messages.catalog import Catalog
+from babel.messages.pofile import write_po
+from babel.support import Translations
+
+import chalice_babel as babel
+from chalice_babel.catalogs import catalog_size, memory_report, trim_catalogs
+
+from app import app
+from chalice.test import Client
+
+
+def test_memory_report():
+    b = babel.Babel(app)
+
+    test = babel.Domain(domain="test")
+
+    with Client(app) as client:
+        records = memory_report(b, domains=["messages", test])
+        test.clear_cache("tr")
+        loaded = memory_report(b, domains="test", loaded_only=True)
+        own = memory_report(b, domains=[test], loaded_only=True)
+
+    by_key = {(record["locale"], record["domain"]): record for record in records}
+    assert by_key["de", "messages"]["messages"] == 3
+    assert by_key["de", "messages"]["bytes"] > 0
+    assert by_key["de", "test"]["messages"] == 1
+    assert by_key["tr", "test"]["messages"] == 0
+    assert by_key["de", "test"] in loaded
+    assert own == [by_key["de", "test"]]
+    assert memory_report(b, domains="unused", loaded_only=True) == []
+
+    with Client(app) as client:
+        translations = b.domain_instance.get_translations("de")
+        assert catalog_size(translations)[0] == by_key["de", "messages"]["messages"]
+        assert [record["locale"] for record in memory_report(b, loaded_only=True)] == [
+            "de",
+            "tr",
+        ]
+
+
+def test_trim_catalogs(tmpdir):
+    template = Catalog()
+    template.add("Used")
+    template.add(("%(num)s apple", "%(num)s apples"))
+    template.add("Fuzzy")
+    template.add("Menu", context="button")
+    with open(str(tmpdir.join("messages.pot")), "wb") as f:
+        write_po(f, template)
+
+    catalog = Catalog(locale="de")
+    catalog.add("Used", "Benutzt")
+    catalog.add(
+        ("%(num)s apple", "%(num)s apples"), ("%(num)s Apfel", "%(num)s Äpfel")
+    )
+    catalog.add("Fuzzy", "Unscharf", flags=["fuzzy"])
+    catalog.add("Menu", "Menü", context="button")
+    catalog.add("Menu", "Speisekarte", context="food")
+    catalog.add("Unused", "Unbenutzt")
+    catalog.obsolete["Old"] = catalog["Used"]
+    directory = tmpdir.mkdir("translations")
+    po_dir = directory.mkdir("de").mkdir("LC_MESSAGES")
+    with open(str(po_dir.join("messages.po")), "wb") as f:
+        write_po(f, catalog, include_previous=True)
+
+    output_dir = str(tmpdir.join("build"))
+    result = trim_catalogs(
+        [str(directory)], str(tmpdir.join("messages.pot")), output_dir=output_dir
+    )
+
+    assert result == {(str(directory), "de"): (3, 4)}
+    trimmed = Translations.load(output_dir, ["de"])
+    assert set(trimmed._catalog) == {
+        "",
+        "Used",
+        ("%(num)s apple", 0),
+        ("%(num)s apple", 1),
+        "button\x04Menu",
+    }
+    assert trimmed.pgettext("button", "Menu") == "Menü"
+    assert trimmed.ngettext("%(num)s apple", "%(num)s apples", 2) == "%(num)s Äpfel"
+    assert not os.path.exists(str(po_dir.join("messages.mo")))
@@ -0,0 +1,47 @@
+import chalice_babel as babel
+from chalice_babel import get_sort_key, lazy_gettext, sort_localized
+from chalice_babel.collation import Collator, fallback_sort_key
+
+from app import app
+from chalice.test import Client
+
+
+def test_fallback_sort_key():
+    words = ["b", "Äpfel", "apfel", "Apfel", "zebra", "Ábaco", "abaco"]
+    assert sorted(words, key=fallback_sort_key) == [
+        "abaco",
+        "Ábaco",
+        "apfel",
+        "Apfel",
+        "Äpfel",
+        "b",
+        "zebra",
+    ]
+
+
+def test_collator_cache():
+    collator = Collator("de", cache_size=2)
+    key = collator.sort_key("Äpfel")
+    assert collator.sort_key("Äpfel") is key
+    collator.sort_key("b")
+    collator.sort_key("c")
+    assert list(collator.cache) == ["c"]
+
+
+def test_sort_localized():
+    b = babel.Babel(app)
+    choices = [{"label": "Zucker"}, {"label": "Äpfel"}, {"label": "Birnen"}]
+
+    with Client(app) as client:
+        with babel.force_locale("de_DE"):
+            assert sort_localized(["b", "Ä", "a", "z"]) == ["a", "Ä", "b", "z"]
+            assert sort_localized(choices, key=lambda c: c["label"]) == [
+                {"label": "Äpfel"},
+                {"label": "Birnen"},
+                {"label": "Zucker"},
+            ]
+            assert sort_localized(["a", "b"], reverse=True) == ["b", "a"]
+            assert get_sort_key() == get_sort_key("de_DE")
+
+            labels = [lazy_gettext("Yes"), lazy_gettext("No")]
+            assert [str(label) for label in sort_localized(labels)] == ["Ja", "No"]
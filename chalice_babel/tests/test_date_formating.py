@@ -1,6 +1,8 @@
 from datetime import datetime, timedelta
 from decimal import Decimal
 
+from babel import dates
+
 import chalice_babel as babel
 
 from app import app
@@ -82,3 +84,54 @@ def test_force_locale():
         with babel.force_locale("en_US"):
             assert str(babel.get_locale()) == "en_US"
         assert str(babel.get_locale()) == "de_DE"
+
+
+def test_format_timedelta_matches_babel():
+    babel.Babel(app)
+    seconds = [0, 1, 44, 59, 61, 3000, 3599, 5400, 86399, 86401, 6 * 86400]
+    seconds += [20 * 86400, 40 * 86400, 200 * 86400, 400 * 86400, 5 * 31536000]
+    seconds += [-value for value in seconds]
+
+    with Client(app) as client:
+        for locale in ["de_DE", "en_US", "tr_TR", "ar"]:
+            with babel.force_locale(locale):
+                for value in seconds:
+                    for granularity in ["second", "hour", "day"]:
+                        for add_direction in [False, True]:
+                            for format in ["long", "short", "narrow"]:
+                                kwargs = dict(
+                                    granularity=granularity,
+                                    add_direction=add_direction,
+                                    format=format,
+                                )
+                                expected = dates.format_timedelta(
+                                    timedelta(seconds=value), locale=locale, **kwargs
+                                )
+                                assert (
+                                    babel.format_timedelta(
+                                        timedelta(seconds=value), **kwargs
+                                    )
+                                    == expected
+                                )
+
+
+def test_format_timedeltas():
+    babel.Babel(app)
+    now = datetime(2010, 4, 12, 13, 46)
+    values = [now - timedelta(minutes=3), now - timedelta(hours=5), timedelta(days=6)]
+
+    with Client(app) as client:
+        with babel.force_locale("de_DE"):
+            assert babel.format_timedeltas(values, now=now) == [
+                "3 Minuten",
+                "5 Stunden",
+                "1 Woche",
+            ]
+            assert babel.format_timedeltas(values, threshold=1, now=now) == [
+                "3 Minuten",
+                "5 Stunden",
+                "6 Tage",
+            ]
+            assert babel.format_timedeltas(
+                [timedelta(minutes=-3), timedelta(days=2)], add_direction=True
+            ) == ["vor 3 Minuten", "in 2 Tagen"]
@@ -0,0 +1,126 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+import chalice_babel as babel
+from chalice_babel import lazy_gettext
+from chalice_babel.export import Column, compile_columns, export_csv, export_jsonl
+
+from app import app
+from chalice.test import Client
+
+COLUMNS = [
+    Column("name", "Name"),
+    Column("amount", "Amount", type="number"),
+    Column("price", "Price", type="currency", currency="EUR"),
+    Column("share", type="percent"),
+    Column("created", "Created", type="datetime"),
+    Column("day", type="date", format="short"),
+    Column("answer", "Answer", choices={True: lazy_gettext("Yes"), False: "No"}),
+]
+
+ROWS = [
+    {
+        "name": "Ada",
+        "amount": Decimal("1099.98"),
+        "price": 12.5,
+        "share": 0.25,
+        "created": datetime(2010, 4, 12, 13, 46),
+        "day": date(2010, 4, 12),
+        "answer": True,
+    },
+    {
+        "name": "Bob",
+        "amount": 3,
+        "price": None,
+        "share": 1,
+        "created": datetime(2021, 1, 1, 23, 5),
+        "day": datetime(2021, 1, 1, 23, 5),
+        "answer": None,
+    },
+]
+
+
+def test_compiled_formatters_match_format_functions():
+    b = babel.Babel(app)
+    b.timezoneselector(lambda: "Europe/Berlin")
+
+    with Client(app) as client:
+        with babel.force_locale("de_DE"):
+            header, getters, formatters = compile_columns(COLUMNS)
+            cells = [format(get(ROWS[0])) for get, format in zip(getters, formatters)]
+            expected_created = babel.format_datetime(ROWS[0]["created"])
+            expected_day = babel.format_date(ROWS[1]["day"], "short")
+            assert formatters[5](ROWS[1]["day"]) == expected_day
+            for format in ("short", "medium", "full", "yyyy-MM-dd HH:mm"):
+                column = Column("created", type="datetime", format=format)
+                value = compile_columns([column])[2][0](ROWS[0]["created"])
+                assert value == babel.format_datetime(ROWS[0]["created"], format)
+            for format in ("short", "medium", "full", "HH:mm zzzz"):
+                column = Column("created", type="time", format=format)
+                value = compile_columns([column])[2][0](ROWS[1]["created"])
+                assert value == babel.format_time(ROWS[1]["created"], format)
+
+    assert header == ["Name", "Amount", "Price", "share", "Created", "day", "Answer"]
+    assert cells == [
+        "Ada",
+        "1.099,98",
+        "12,50\xa0€",
+        "25\xa0%",
+        expected_created,
+        "12.04.10",
+        "Ja",
+    ]
+
+
+def test_export_csv():
+    b = babel.Babel(app)
+
+    with Client(app) as client:
+        with babel.force_locale("de_DE"):
+            chunks = export_csv(iter(ROWS * 500), COLUMNS, chunk_size=4096)
+        # consumed after leaving the locale
+        chunks = list(chunks)
+
+    assert all(isinstance(chunk, bytes) for chunk in chunks)
+    assert len(chunks) > 1
+    assert all(len(chunk) < 4096 + 512 for chunk in chunks)
+    rows = list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+    assert len(rows) == 1001
+    assert rows[1][:3] == ["Ada", "1.099,98", "12,50\xa0€"]
+    assert rows[2][2] == "" and rows[2][6] == ""
+
+
+def test_export_jsonl():
+    b = babel.Babel(app)
+
+    with Client(app) as client:
+        with babel.force_locale("tr_TR"):
+            chunks = list(export_jsonl(ROWS, COLUMNS[:2] + COLUMNS[6:]))
+
+    lines = b"".join(chunks).decode("utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"name": "Ada", "amount": "1.099,98", "answer": "Evet"},
+        {"name": "Bob", "amount": "3", "answer": None},
+    ]
+
+
+def test_export_jsonl_keys():
+    b = babel.Babel(app)
+    columns = [
+        Column(0, lazy_gettext("Yes")),
+        Column(lambda row: row[1] * 2, lazy_gettext("Yes"), type="number"),
+        Column(lambda row: row[1], "Amount", type="number"),
+    ]
+
+    with Client(app) as client:
+        with babel.force_locale("de_DE"):
+            chunks = list(export_jsonl([("Ada", 1500)], columns))
+
+    assert json.loads(b"".join(chunks)) == {
+        "0": "Ada",
+        "Yes": "3.000",
+        "Amount": "1.500",
+    }
@@ -0,0 +1,92 @@
+import os
+
+from babel.messages.pofile import read_po
+
+from chalice_babel import extract
+from chalice_babel.extract import extract_messages, find_sources
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def make_project(base):
+    write(
+        os.path.join(base, "app.py"),
+        "from chalice_babel import gettext, ngettext\n"
+        "gettext('Hello %(name)s!', name='Peter')\n"
+        "ngettext('%(num)s Apple', '%(num)s Apples', 3)\n",
+    )
+    write(
+        os.path.join(base, "chalicelib", "labels.py"),
+        "from chalice_babel import lazy_gettext\n"
+        "# TRANSLATORS: shown on the status badge\n"
+        "ACTIVE = lazy_gettext('Active')\n",
+    )
+    write(
+        os.path.join(base, "chalicelib", "templates", "page.html"),
+        "{% cache 'title' %}{{ _('Page title') }}{% endcache %}\n"
+        "{% trans %}Welcome{% endtrans %}\n",
+    )
+    write(
+        os.path.join(base, "chalicelib", "translations", "de", "ignored.py"),
+        "gettext('Ignored')\n",
+    )
+
+
+def test_find_sources(tmpdir):
+    base = str(tmpdir)
+    make_project(base)
+    assert list(find_sources(base)) == [
+        ("app.py", "python"),
+        ("chalicelib/labels.py", "python"),
+        ("chalicelib/templates/page.html", "jinja2.ext:babel_extract"),
+    ]
+
+
+def test_extract_messages(tmpdir):
+    base = str(tmpdir)
+    make_project(base)
+
+    catalog, extracted, cached = extract_messages(base, workers=2)
+    assert (extracted, cached) == (3, 0)
+
+    with open(os.path.join(base, "messages.pot"), "rb") as f:
+        pot = read_po(f)
+    assert {message.id for message in pot if message.id} == {
+        "Hello %(name)s!",
+        ("%(num)s Apple", "%(num)s Apples"),
+        "Active",
+        "Page title",
+        "Welcome",
+    }
+    assert pot["Active"].auto_comments == ["TRANSLATORS: shown on the status badge"]
+    assert pot["Page title"].locations == [("chalicelib/templates/page.html", 1)]
+
+
+def test_incremental_extraction(tmpdir, mocker):
+    base = str(tmpdir)
+    make_project(base)
+    extract_messages(base, workers=1)
+
+    spy = mocker.spy(extract, "extract_source")
+    catalog, extracted, cached = extract_messages(base, workers=1)
+    assert (extracted, cached) == (0, 3)
+    assert spy.call_count == 0
+    assert "Welcome" in catalog
+
+    write(
+        os.path.join(base, "chalicelib", "labels.py"),
+        "from chalice_babel import lazy_gettext\nINACTIVE = lazy_gettext('Inactive')\n",
+    )
+    catalog, extracted, cached = extract_messages(base, workers=1)
+    assert (extracted, cached) == (1, 2)
+    assert spy.call_count == 1
+    assert "Inactive" in catalog and "Active" not in catalog
+
+    catalog, extracted, cached = extract_messages(
+        base, workers=1, keywords={"translate": None}
+    )
+    assert extracted == 3
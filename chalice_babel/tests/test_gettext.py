@@ -1,3 +1,8 @@
+import threading
+import time
+
+import pytest
+
 import chalice_babel as babel
 from chalice_babel import (
     Domain,
@@ -9,6 +14,7 @@ from chalice_babel import (
 )
 
 from app import app
+from chalice import Chalice
 from chalice.test import Client
 
 
@@ -148,3 +154,242 @@ def test_cache(mocker):
         }
         assert babel.gettext("Yes") == "Ja"
     assert load_mock.call_count == 4
+
+
+def test_precompiled_formatters():
+    b = babel.Babel(app)
+    domain = Domain(domain="messages")
+
+    with Client(app) as client:
+        with babel.force_locale("de_DE"):
+            assert domain.gettext("Hello %(name)s!", name="Peter") == "Hallo Peter!"
+            assert domain.gettext("Hello %(name)s!", name="Anna") == "Hallo Anna!"
+            assert domain.ngettext("%(num)s Apple", "%(num)s Apples", 3) == "3 Äpfel"
+            assert domain.ngettext("%(num)s Apple", "%(num)s Apples", 7) == "7 Äpfel"
+            assert domain.ngettext("%(num)s Apple", "%(num)s Apples", 1) == "1 Apfel"
+
+    assert ("de_DE", None, "Hello %(name)s!") in domain.formatters
+    assert ("de_DE", None, "Yes") in domain.formatters
+    assert {key for key in domain.formatters if len(key) > 3} == {
+        ("de_DE", None, "%(num)s Apple", "%(num)s Apples", 1, False),
+        ("de_DE", None, "%(num)s Apple", "%(num)s Apples", 0, True),
+    }
+
+
+def test_untranslated_strings_cache_is_bounded():
+    b = babel.Babel(app)
+    domain = Domain(domain="messages")
+    domain.misses_cache_size = 10
+
+    with Client(app) as client:
+        with babel.force_locale("de_DE"):
+            domain.gettext("Yes")
+            size = len(domain.formatters)
+            for i in range(100):
+                assert domain.gettext("user input %d" % i) == "user input %d" % i
+                assert domain.ngettext("%(num)s Pear", "%(num)s Pears", i)
+            assert domain.gettext("Value: %(value)s", value=1) == "Value: 1"
+            assert domain.gettext("Value: %(value)s", value=2) == "Value: 2"
+    assert len(domain.formatters) == size
+    assert len(domain.misses) == 10
+    assert ("de_DE", None, "Value: %(value)s") in domain.misses
+
+
+def test_placeholder_validation():
+    b = babel.Babel(app)
+    domain = Domain(domain="messages")
+    translations = babel.support.Translations()
+    translations._catalog["Hello %(name)s!"] = "Hallo %(nmae)s!"
+    translations._catalog["Value: %(value)s"] = "Wert: %(value)s"
+    domain.cache["de_DE", "messages"] = translations
+
+    with Client(app) as client:
+        with babel.force_locale("de_DE"):
+            assert domain.gettext("Hello %(name)s!", name="Peter") == "Hello Peter!"
+            assert domain.gettext("Value: %(value)s", value=42) == "Wert: 42"
+            assert domain.gettext("100%") == "100%"
+
+
+def test_placeholder_validation_on_load(mocker, caplog):
+    b = babel.Babel(app)
+    domain = Domain(domain="messages")
+    translations = babel.support.Translations()
+    translations._catalog["Hello %(name)s!"] = "Hallo %(nmae)s!"
+    translations._catalog["ctx\x04Value: %(value)s"] = "Wert: %(value)s"
+    mocker.patch.object(domain, "load_translations", return_value=translations)
+
+    domain.get_translations("de_DE")
+    assert "nmae" in caplog.text
+    assert domain.formatters["de_DE", None, "Hello %(name)s!"].string == (
+        "Hello %(name)s!"
+    )
+    assert domain.formatters["de_DE", "ctx", "Value: %(value)s"].string == (
+        "Wert: %(value)s"
+    )
+
+
+def test_gettext_many():
+    b = babel.Babel(app)
+
+    with Client(app) as client:
+        with babel.force_locale("de_DE"):
+            assert babel.gettext_many(["Yes", "first", "Hello %(name)s!"]) == [
+                "Ja",
+                "first",
+                "Hallo %(name)s!",
+            ]
+            translated = babel.gettext_many(iter(["Yes", "Yes"]), stream=True)
+        assert list(translated) == ["Ja", "Ja"]
+
+
+def test_translate_payload():
+    b = babel.Babel(app)
+    payload = {
+        "label": "Yes",
+        "id": "Yes",
+        "choices": ["Yes", {"label": "Yes", "count": 3}],
+        "lazy": lazy_ngettext("%(num)s Apple", "%(num)s Apples", 3),
+        "domain_lazy": Domain(domain="test").lazy_gettext("first"),
+    }
+
+    with Client(app) as client:
+        with babel.force_locale("de_DE"):
+            assert babel.translate_payload(payload, keys=["label", "choices"]) == {
+                "label": "Ja",
+                "id": "Yes",
+                "choices": ["Ja", {"label": "Ja", "count": 3}],
+                "lazy": "3 Äpfel",
+                "domain_lazy": "erste",
+            }
+            assert babel.translate_payload(["Yes", 1]) == ["Ja", 1]
+            rows = babel.translate_payload(
+                iter([{"label": "Yes"}, {"label": "No"}]), keys=["label"], stream=True
+            )
+        assert list(rows) == [{"label": "Ja"}, {"label": "No"}]
+
+    with pytest.raises(TypeError):
+        babel.translate_payload({"label": "Yes"}, keys=["label"], stream=True)
+
+
+def test_single_flight_loading(mocker):
+    load = babel.support.Translations.load
+
+    def slow_load(*args, **kwargs):
+        time.sleep(0.01)
+        return load(*args, **kwargs)
+
+    load_mock = mocker.patch("babel.support.Translations.load", side_effect=slow_load)
+    b = babel.Babel(app, default_locale="de_DE")
+    domain = Domain(domain="messages")
+    directories = list(b.translation_directories)
+    barrier = threading.Barrier(32)
+    results = []
+
+    def worker(locale):
+        barrier.wait()
+        for _ in range(50):
+            results.append(domain.get_translations(locale))
+
+    threads = [
+        threading.Thread(target=worker, args=(("de", "tr")[i % 2],))
+        for i in range(32)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert load_mock.call_count == 2 * len(directories)
+    assert len(results) == 32 * 50
+    assert len({id(translations) for translations in results}) == 2
+    assert domain._loading == {}
+
+
+def test_domain_instance_is_shared():
+    b = babel.Babel(app)
+    barrier = threading.Barrier(16)
+    instances = []
+
+    def worker():
+        barrier.wait()
+        instances.append(b.domain_instance)
+
+    threads = [threading.Thread(target=worker) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(instance) for instance in instances}) == 1
+
+
+def test_domain_instance_getter_stores_under_lock(mocker):
+    # Call the getter directly, like cached_property does on Pythons where
+    # it no longer locks, so only the getter's own lock is tested.
+    domain_class = babel.Domain
+
+    def slow_domain(*args, **kwargs):
+        time.sleep(0.01)
+        return domain_class(*args, **kwargs)
+
+    mocker.patch("chalice_babel.Domain", side_effect=slow_domain)
+    b = babel.Babel(app)
+    getter = babel.Babel.domain_instance.func
+    barrier = threading.Barrier(8)
+    instances = []
+
+    def worker():
+        barrier.wait()
+        instances.append(getter(b))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(instance) for instance in instances}) == 1
+    assert b.domain_instance is instances[0]
+
+
+def test_activate_babel_instance():
+    other = Chalice(app_name="other")
+    tenant = babel.Babel(other)
+    tenant.localeselector(lambda: "tr")
+    b = babel.Babel(app)
+    b.localeselector(lambda: "de_DE")
+    assert babel.get_babel() is b
+
+    with Client(app) as client:
+        assert babel.gettext("Yes") == "Ja"
+        with tenant.activate():
+            assert babel.get_babel() is tenant
+            assert str(babel.get_locale()) == "tr"
+            assert babel.gettext("Yes") == "Evet"
+        assert babel.gettext("Yes") == "Ja"
+
+
+def test_locale_environments():
+    b = babel.Babel(app, locale_environments=True)
+    shared_gettext = b.jinja2_env.globals["gettext"]
+
+    with Client(app) as client:
+        with babel.force_locale("de_DE"):
+            assert babel.render_template(
+                "greeting.html", {"name": "Ada", "count": 2}
+            ) == ("<p>Hallo Ada!</p>\n<p>2 Äpfel</p>")
+            assert render_template_string("{{ gettext('Yes') }}") == "Ja"
+            env = b.get_jinja_env()
+        with babel.force_locale("tr_TR"):
+            assert render_template_string("{{ gettext('Yes') }}") == "Evet"
+            assert b.get_jinja_env() is not env
+            # the shared environment keeps resolving the locale per call
+            template = b.jinja2_env.from_string("{{ gettext('Yes') }}")
+            assert template.render() == "Evet"
+
+    assert b.get_jinja_env("de_DE") is env
+    assert env is not b.jinja2_env
+    assert b.jinja2_env.globals["gettext"] is shared_gettext
+    assert sorted(b.locale_envs) == ["de_DE", "tr_TR"]
+    b.clear_cache("de_DE")
+    assert sorted(b.locale_envs) == ["tr_TR"]
@@ -0,0 +1,116 @@
+import json
+import threading
+from datetime import datetime
+
+import chalice_babel as babel
+from chalice import Response
+from chalice_babel import instrumentation
+from chalice_babel.instrumentation import (
+    Counters,
+    ServerTimingMiddleware,
+    add_hook,
+    remove_hook,
+)
+
+from app import app
+from chalice.test import Client
+
+
+def test_counters():
+    b = babel.Babel(app)
+    counters = add_hook(Counters())
+    try:
+        with Client(app) as client:
+            with babel.force_locale("de_DE"):
+                babel.format_number(1099)
+                babel.format_datetime(datetime(2010, 4, 12, 13, 46))
+                babel.gettext("Yes")
+                babel.get_translations()
+                babel.render_template_string("{{ gettext('Yes') }}")
+    finally:
+        remove_hook(counters)
+
+    assert counters.counts["format", "format_number"] == 1
+    assert counters.counts["format", "format_datetime"] == 1
+    assert counters.counts["get_locale", "get_locale"] >= 2
+    assert counters.counts["catalog_load", "messages"] == 1
+    assert counters.counts["cache_miss", "translations"] == 1
+    assert counters.counts["cache_hit", "translations"] >= 1
+    assert counters.counts["render_template", "render_template_string"] == 1
+    assert counters.durations["catalog_load", "messages"] > 0
+
+    locale_calls = counters.counts["get_locale", "get_locale"]
+    babel.format_number(1)
+    assert counters.counts["format", "format_number"] == 1
+    assert counters.counts["get_locale", "get_locale"] == locale_calls
+
+
+def test_server_timing_middleware():
+    b = babel.Babel(app)
+    lines = []
+    middleware = ServerTimingMiddleware(
+        sink=lines.append, dimensions={"Service": "test"}
+    )
+
+    def get_response(event):
+        babel.format_number(1099)
+        babel.format_percent(0.19)
+        return Response(body="", headers={"Server-Timing": "db;dur=1"})
+
+    try:
+        with Client(app) as client:
+            response = middleware(None, get_response)
+    finally:
+        remove_hook(instrumentation.request_hook)
+
+    header = response.headers["Server-Timing"]
+    assert header.startswith("db;dur=1, ")
+    assert "format;dur=" in header and "get_locale;dur=" in header
+
+    record = json.loads(lines[0])
+    directive = record["_aws"]["CloudWatchMetrics"][0]
+    assert directive["Namespace"] == "ChaliceBabel"
+    assert directive["Dimensions"] == [["Service"]]
+    assert {"Name": "format", "Unit": "Milliseconds"} in directive["Metrics"]
+    assert record["Service"] == "test"
+    assert record["format"] > 0
+    assert instrumentation.hooks == []
+
+
+def test_server_timing_per_request_in_threads():
+    b = babel.Babel(app)
+    middleware = ServerTimingMiddleware(sink=None)
+    barrier = threading.Barrier(2)
+    headers = {}
+
+    def formatting(event):
+        babel.format_number(1099)
+        barrier.wait()
+        babel.format_number(1099)
+        return Response(body="")
+
+    def rendering(event):
+        babel.render_template_string("plain")
+        barrier.wait()
+        babel.render_template_string("plain")
+        return Response(body="")
+
+    def worker(name, get_response):
+        headers[name] = middleware(None, get_response).headers["Server-Timing"]
+
+    threads = [
+        threading.Thread(target=worker, args=("format", formatting)),
+        threading.Thread(target=worker, args=("render", rendering)),
+    ]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        remove_hook(instrumentation.request_hook)
+
+    assert "format;dur=" in headers["format"]
+    assert "render_template" not in headers["format"]
+    assert "render_template;dur=" in headers["render"]
+    assert "format" not in headers["render"]
@@ -0,0 +1,26 @@
+from chalice_babel.message_formatter import MessageFormatter, parse_placeholders
+
+
+def test_parse_placeholders():
+    assert parse_placeholders("Hello %(name)s!") == {"name"}
+    assert parse_placeholders("%(num)d of %(total)0.2f") == {"num", "total"}
+    assert parse_placeholders("100%% of %s") == {None}
+    assert parse_placeholders("Plain text") == set()
+
+
+def test_formatter():
+    formatter = MessageFormatter("Hallo %(name)s!", ("Hello %(name)s!",))
+    assert formatter({"name": "Peter"}) == "Hallo Peter!"
+    assert formatter({}) == "Hallo %(name)s!"
+    assert MessageFormatter("Ja")({"unused": 1}) == "Ja"
+    assert MessageFormatter("100%%")({"x": 1}) == "100%"
+
+
+def test_formatter_falls_back_on_unknown_placeholders():
+    formatter = MessageFormatter("%(count)s Äpfel", ("%(num)s Apples",))
+    assert formatter.string == "%(num)s Apples"
+
+    formatter = MessageFormatter(
+        "%(num)s Äpfel", ("Apples", "Apple"), extra=("num",)
+    )
+    assert formatter({"num": 2}) == "2 Äpfel"
@@ -0,0 +1,110 @@
+import threading
+import time
+
+import chalice_babel as babel
+import pytest
+from chalice import Chalice, Response
+from chalice_babel.aio import locale_var
+from chalice_babel.middleware import LocaleMiddleware
+
+from app import app
+from chalice.test import Client
+
+calls = []
+
+
+@pytest.fixture
+def middleware_app():
+    # A separate app, so the middleware does not wrap the requests of the
+    # other test modules that share ``app``.
+    middleware_app = Chalice(app_name="chalice_babel_middleware_test")
+    b = babel.Babel(middleware_app, default_locale="en")
+    middleware_app.register_middleware(LocaleMiddleware(b), "http")
+
+    @middleware_app.route("/middleware/greeting")
+    def greeting():
+        return {"answer": babel.gettext("Yes"), "locale": str(babel.get_locale())}
+
+    return middleware_app
+
+
+def test_negotiates_locale(middleware_app):
+    with Client(middleware_app) as client:
+        response = client.http.get(
+            "/middleware/greeting",
+            headers={"Accept-Language": "de-DE,tr;q=0.9,en;q=0.5"},
+        )
+        assert response.json_body == {"answer": "Evet", "locale": "tr"}
+        assert response.headers["Content-Language"] == "tr"
+        assert response.headers["Vary"] == "Accept-Language"
+    assert locale_var.get() is None
+
+
+def test_missing_accept_language(middleware_app):
+    with Client(middleware_app) as client:
+        response = client.http.get("/middleware/greeting")
+        assert response.json_body == {"answer": "Yes", "locale": "en"}
+        assert response.headers["Content-Language"] == "en"
+
+
+def test_selector_runs_once():
+    b = babel.Babel(app, default_locale="en")
+    middleware = LocaleMiddleware(b)
+
+    @b.localeselector
+    def select_locale():
+        calls.append(1)
+        return "tr"
+
+    def get_response(event):
+        for _ in range(3):
+            assert babel.gettext("Yes") == "Evet"
+        return Response(body="", headers={"Vary": "Accept-Encoding"})
+
+    with Client(app) as client:
+        response = middleware(None, get_response)
+    assert len(calls) == 1
+    assert response.headers["Content-Language"] == "tr"
+    assert response.headers["Vary"] == "Accept-Encoding, Accept-Language"
+
+
+def test_concurrent_requests_keep_their_locale():
+    b = babel.Babel(app, default_locale="en")
+    middleware = LocaleMiddleware(b)
+    local = threading.local()
+    errors = []
+
+    @b.localeselector
+    def select_locale():
+        return local.locale
+
+    def get_response(event):
+        time.sleep(0.001)
+        return Response(body=str(babel.get_locale()))
+
+    def worker(locale):
+        local.locale = locale
+        for _ in range(20):
+            response = middleware(None, get_response)
+            language = response.headers["Content-Language"]
+            if response.body != locale or language != locale:
+                errors.append((locale, response.body, language))
+
+    threads = [
+        threading.Thread(target=worker, args=(locale,)) for locale in ["de", "tr"]
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+
+def test_best_match():
+    b = babel.Babel(app, default_locale="en")
+    assert b.best_match("") == "en"
+    assert b.best_match(None) == "en"
+    assert b.best_match("tr-TR") == "tr"
+    assert b.best_match("fr;q=0.2, en;q=0.8, tr") == "tr"
+    assert b.best_match("fr, *;q=0.5") == "en"
+    assert b.best_match("tr;q=0, fr") == "en"
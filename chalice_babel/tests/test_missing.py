@@ -0,0 +1,123 @@
+import random
+import threading
+
+import chalice_babel as babel
+from chalice_babel import Domain
+from chalice_babel.missing import (
+    FileSink,
+    MissingTracker,
+    install,
+    merge_reports,
+    write_work_list,
+)
+
+from app import app
+from chalice.test import Client
+
+
+def test_bounded_counting():
+    records = []
+    tracker = MissingTracker(
+        sink=records.extend, capacity=2, sample_rate=1, flush_interval=0
+    )
+    for _ in range(3):
+        tracker.record("de", "messages", "a")
+    tracker.record("de", "messages", "b")
+    tracker.record("de", "messages", "c")
+
+    assert len(tracker.counts) == 2
+    assert tracker.counts["de", "messages", None, "a", None] == 3
+    assert tracker.counts["de", "messages", None, "c", None] == 2
+
+    tracker.flush()
+    assert records[0] == {
+        "locale": "de",
+        "domain": "messages",
+        "context": None,
+        "msgid": "a",
+        "msgid_plural": None,
+        "count": 3,
+    }
+    assert tracker.counts == {}
+
+
+def test_space_saving_evicts_least_counted():
+    tracker = MissingTracker(sink=list, capacity=10, sample_rate=1, flush_interval=0)
+    rng = random.Random(0)
+    for i in range(2000):
+        tracker.record("de", "messages", "hot%d" % (i % 3))
+        tracker.record("de", "messages", "cold%d" % rng.randrange(500))
+
+    assert len(tracker.counts) == 10
+    assert sum(tracker.counts.values()) == 4000
+    hot = {key: count for key, count in tracker.counts.items() if "hot" in key[3]}
+    assert len(hot) == 3
+    assert min(hot.values()) >= 666
+    assert len(tracker._heap) == 10
+
+
+def test_flush_thread():
+    flushed = threading.Event()
+    records = []
+
+    def sink(batch):
+        records.extend(batch)
+        flushed.set()
+
+    tracker = MissingTracker(sink=sink, sample_rate=1, flush_interval=0.01)
+    tracker.record("de", "messages", "a")
+    assert flushed.wait(5)
+    tracker.record("de", "messages", "b")
+    tracker.close()
+    assert [record["msgid"] for record in records] == ["a", "b"]
+    assert tracker.counts == {}
+
+
+def test_sampling():
+    tracker = MissingTracker(sink=list, sample_rate=0, flush_interval=0)
+    tracker.record("de", "messages", "a")
+    assert tracker.counts == {}
+
+    tracker = MissingTracker(sink=list, sample_rate=0.5, flush_interval=0)
+    tracker.counts["de", "messages", None, "a", None] = 10
+    assert tracker.report()[0]["count"] == 20
+
+
+def test_domain_records_misses(tmpdir):
+    b = babel.Babel(app)
+    path = str(tmpdir.join("missing.jsonl"))
+    tracker = install(
+        MissingTracker(
+            sink=FileSink(path), sample_rate=1, flush_interval=0, ignore_locales=["en"]
+        )
+    )
+    try:
+        with Client(app) as client:
+            with babel.force_locale("de_DE"):
+                assert babel.gettext("Yes") == "Ja"
+                assert babel.gettext("Untranslated") == "Untranslated"
+                assert babel.gettext("Untranslated") == "Untranslated"
+                assert babel.ngettext("%(num)s Pear", "%(num)s Pears", 2) == "2 Pears"
+                apples = babel.ngettext("%(num)s Apple", "%(num)s Apples", 2)
+                assert apples == "2 Äpfel"
+                assert Domain(domain="test").gettext("first") == "erste"
+            with babel.force_locale("en"):
+                babel.gettext("Untranslated")
+    finally:
+        install(None)
+    tracker.flush()
+
+    totals = merge_reports([path])
+    assert totals == {
+        ("messages", None, "Untranslated", None): {"de_DE": 2},
+        ("messages", None, "%(num)s Pear", "%(num)s Pears"): {"de_DE": 1},
+    }
+
+    output = str(tmpdir.join("missing.pot"))
+    catalog = write_work_list(totals, output)
+    assert [message.id for message in catalog if message.id] == [
+        "Untranslated",
+        ("%(num)s Pear", "%(num)s Pears"),
+    ]
+    with open(output, encoding="utf-8") as f:
+        assert "#. missing: de_DE (2)" in f.read()
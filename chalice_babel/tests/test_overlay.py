@@ -0,0 +1,77 @@
+from babel.messages.catalog import Catalog
+from babel.messages.mofile import write_mo
+
+import chalice_babel as babel
+from chalice_babel import Domain, OverlayDomain
+
+from app import app
+from chalice.test import Client
+
+
+def write_tenant(directory, messages):
+    catalog = Catalog(locale="de")
+    for msgid, string in messages:
+        catalog.add(msgid, string)
+    po_dir = directory.mkdir("de").mkdir("LC_MESSAGES")
+    with open(str(po_dir.join("messages.mo")), "wb") as f:
+        write_mo(f, catalog)
+    return str(directory)
+
+
+def test_overlay_domain(tmpdir, mocker):
+    b = babel.Babel(app)
+    base = Domain(domain="messages")
+    load = mocker.spy(base, "load_translations")
+    messages = [
+        ("Yes", "Jawohl"),
+        (("%(num)s Apple", "%(num)s Apples"), ("Ein Apfel", "%(num)s Äpfel!")),
+    ]
+    acme = OverlayDomain(base, write_tenant(tmpdir.mkdir("acme"), messages))
+    globex = OverlayDomain(base, write_tenant(tmpdir.mkdir("globex"), [("No", "Nein")]))
+
+    with Client(app) as client:
+        with babel.force_locale("de_DE"):
+            assert acme.gettext("Yes") == "Jawohl"
+            assert acme.gettext("Hello %(name)s!", name="Ada") == "Hallo Ada!"
+            assert acme.ngettext("%(num)s Apple", "%(num)s Apples", 1) == "Ein Apfel"
+            assert acme.ngettext("%(num)s Apple", "%(num)s Apples", 3) == "3 Äpfel!"
+            assert globex.gettext("Yes") == "Ja"
+            assert globex.ngettext("%(num)s Apple", "%(num)s Apples", 3) == "3 Äpfel"
+            assert base.gettext("Yes") == "Ja"
+
+    overrides = acme.get_translations("de_DE")
+    assert set(overrides._catalog) == {
+        "",
+        "Yes",
+        ("%(num)s Apple", 0),
+        ("%(num)s Apple", 1),
+    }
+    assert overrides._fallback is base.get_translations("de_DE")
+    assert globex.get_translations("de_DE")._fallback is overrides._fallback
+    assert load.call_count == 1
+    # messages that are not overridden are formatted by the base domain
+    assert ("de_DE", None, "Hello %(name)s!") in base.formatters
+    assert ("de_DE", None, "Hello %(name)s!") not in acme.formatters
+
+
+def test_overlay_eviction(tmpdir, mocker):
+    b = babel.Babel(app)
+    base = Domain(domain="messages")
+    acme = OverlayDomain(base, write_tenant(tmpdir.mkdir("acme"), [("Yes", "Jawohl")]))
+    load = mocker.spy(base, "load_translations")
+
+    with Client(app) as client:
+        with babel.force_locale("de_DE"):
+            assert acme.gettext("Yes") == "Jawohl"
+            acme.clear_cache("de_DE")
+            assert acme.get_translations_cache() == {}
+            assert acme.formatters == {}
+            assert base.get_translations_cache() != {}
+            assert acme.gettext("Yes") == "Jawohl"
+            assert load.call_count == 1
+
+            base.clear_cache()
+            assert acme.get_translations_cache() == {}
+            assert acme.gettext("Yes") == "Jawohl"
+            assert acme.gettext("No") == "No"
+            assert load.call_count == 2
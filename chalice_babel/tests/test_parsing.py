@@ -0,0 +1,76 @@
+from datetime import date, time
+from decimal import Decimal
+
+import pytest
+from babel import dates, numbers
+
+import chalice_babel as babel
+from chalice_babel.parsing import DateParser, NumberParser, TimeParser
+
+from app import app
+from chalice.test import Client
+
+
+def test_parse_numbers():
+    b = babel.Babel(app)
+
+    with Client(app) as client:
+        with babel.force_locale("de_DE"):
+            assert babel.parse_decimal("1.099,98") == Decimal("1099.98")
+            assert babel.parse_number("1.099") == 1099
+            assert babel.parse_decimal_many(["1,5", "2.000,25"]) == [
+                Decimal("1.5"),
+                Decimal("2000.25"),
+            ]
+            assert babel.parse_number_many(["1.000", "2"]) == [1000, 2]
+            with pytest.raises(numbers.NumberFormatError):
+                babel.parse_decimal("abc")
+            with pytest.raises(numbers.NumberFormatError):
+                babel.parse_decimal("1.099,98,1", strict=True)
+        with babel.force_locale("en_US"):
+            assert babel.parse_decimal("1,099.98") == Decimal("1099.98")
+
+
+@pytest.mark.parametrize("locale", ["de", "fr", "en_US", "de_CH"])
+def test_number_parser_matches_babel(locale):
+    parser = NumberParser(locale)
+    value = numbers.format_decimal(Decimal("1099.98"), locale=locale)
+    assert parser.parse_decimal(value) == numbers.parse_decimal(value, locale=locale)
+    assert parser.parse_decimal(value) == Decimal("1099.98")
+
+
+def test_number_parser_accepts_plain_spaces():
+    assert NumberParser("fr").parse_decimal("1 099,98") == Decimal("1099.98")
+
+
+def test_parse_dates_and_times():
+    b = babel.Babel(app)
+
+    with Client(app) as client:
+        with babel.force_locale("de_DE"):
+            assert babel.parse_date("12.04.2010") == date(2010, 4, 12)
+            assert babel.parse_date("2010-04-12") == date(2010, 4, 12)
+            assert babel.parse_time("15:30:05") == time(15, 30, 5)
+            assert babel.parse_date_many(["1.2.20", "31.12.2021"]) == [
+                date(2020, 2, 1),
+                date(2021, 12, 31),
+            ]
+        with babel.force_locale("en_US"):
+            assert babel.parse_date("4/12/10", format="short") == date(2010, 4, 12)
+            assert babel.parse_time_many(["3:30 PM", "12:15 AM", "12:15 PM"]) == [
+                time(15, 30),
+                time(0, 15),
+                time(12, 15),
+            ]
+            with pytest.raises(dates.ParseError):
+                babel.parse_time("noon")
+
+
+@pytest.mark.parametrize("locale", ["de", "en_US", "ja", "tr"])
+def test_date_parser_matches_babel(locale):
+    value = dates.format_date(date(2021, 11, 7), format="short", locale=locale)
+    expected = dates.parse_date(value, locale=locale, format="short")
+    assert DateParser(locale, "short").parse(value) == expected
+
+    value = dates.format_time(time(9, 5, 30), format="medium", locale=locale)
+    assert TimeParser(locale).parse(value) == time(9, 5, 30)
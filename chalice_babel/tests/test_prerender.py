@@ -0,0 +1,75 @@
+import json
+import os
+
+import chalice_babel as babel
+from chalice_babel import instrumentation
+from chalice_babel.prerender import (
+    PrerenderedStore,
+    prerender_templates,
+    render_prerendered,
+)
+
+from app import app
+from chalice.test import Client
+
+
+def test_prerender_templates(tmpdir):
+    b = babel.Babel(app)
+    output_dir = str(tmpdir)
+
+    with Client(app) as client:
+        manifest = prerender_templates(b, ["legal.html"], output_dir=output_dir)
+
+    assert sorted(manifest["legal.html"]) == ["de", "tr"]
+    with open(os.path.join(output_dir, "manifest.json")) as f:
+        assert json.load(f) == manifest
+    entry = manifest["legal.html"]["de"]
+    assert entry["path"].startswith("de/legal.") and entry["path"].endswith(".html")
+    with open(os.path.join(output_dir, entry["path"])) as f:
+        assert f.read() == "<p>Ja</p>"
+
+    store = PrerenderedStore(output_dir)
+    assert store.get("legal.html", "tr") == "<p>Evet</p>"
+    assert store.get("legal.html", "fr") is None
+    assert store.etag("legal.html", "de") == entry["etag"]
+
+
+def test_prerender_in_process_matches_pool(tmpdir):
+    b = babel.Babel(app)
+
+    with Client(app) as client:
+        pooled = prerender_templates(
+            b, ["legal.html"], output_dir=str(tmpdir.mkdir("a")), workers=2
+        )
+        inline = prerender_templates(
+            b, ["legal.html"], output_dir=str(tmpdir.mkdir("b")), workers=1
+        )
+    assert pooled == inline
+
+
+def test_render_prerendered(tmpdir):
+    b = babel.Babel(app)
+    output_dir = str(tmpdir)
+    counters = instrumentation.Counters()
+    instrumentation.add_hook(counters)
+
+    try:
+        with Client(app) as client:
+            prerender_templates(b, ["legal.html"], output_dir=output_dir, workers=1)
+            with babel.force_locale("de_DE"):
+                # only de was pre-rendered
+                assert render_prerendered("legal.html", directory=output_dir) == (
+                    "<p>Ja</p>"
+                )
+            with babel.force_locale("de"):
+                assert render_prerendered("legal.html", directory=output_dir) == (
+                    "<p>Ja</p>"
+                )
+                assert render_prerendered(
+                    "greeting.html", {"name": "Ada", "count": 1}, directory=output_dir
+                ) == ("<p>Hallo Ada!</p>\n<p>1 Apfel</p>")
+    finally:
+        instrumentation.remove_hook(counters)
+
+    assert counters.counts["cache_hit", "prerendered"] == 2
+    assert counters.counts["cache_miss", "prerendered"] == 1
@@ -0,0 +1,143 @@
+import threading
+import time
+
+import chalice_babel as babel
+from chalice_babel import render_template, render_template_string
+from chalice_babel.cache import BaseCache, FragmentCacheExtension, SimpleCache
+
+from app import app
+from chalice.test import Client
+from jinja2 import DictLoader, Environment
+
+
+class RedisStandIn(BaseCache):
+    """Mimics a Redis backend: values are stored as bytes with an expiry."""
+
+    def __init__(self, default_timeout=300):
+        super().__init__(default_timeout)
+        self.store = {}
+        self.gets = 0
+
+    def get(self, key):
+        self.gets += 1
+        value = self.store.get(key.encode("utf-8"))
+        if value is None:
+            return None
+        expires, data = value
+        if expires and expires <= time.time():
+            del self.store[key.encode("utf-8")]
+            return None
+        return data.decode("utf-8")
+
+    def set(self, key, value, timeout=None):
+        timeout = self._normalize_timeout(timeout)
+        expires = time.time() + timeout if timeout else 0
+        self.store[key.encode("utf-8")] = (expires, value.encode("utf-8"))
+        return True
+
+    def clear(self):
+        self.store.clear()
+        return True
+
+
+def test_simple_cache():
+    cache = SimpleCache(threshold=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert len(cache) == 2
+
+    cache.set("d", "4", timeout=-1)
+    assert cache.get("d") is None
+    assert cache.delete("a")
+    assert cache.get("a") is None
+
+
+def test_render_template_cache(mocker):
+    b = babel.Babel(app)
+    render = mocker.spy(b.app.chalice_babel["jinja2_env"], "get_or_select_template")
+    context = {"name": "Peter", "count": 3}
+
+    with Client(app) as client:
+        with babel.force_locale("de_DE"):
+            first = render_template("greeting.html", context, cache=True)
+            assert "Hallo Peter!" in first and "3 Äpfel" in first
+            assert render_template("greeting.html", context, cache=True) == first
+            assert render.call_count == 1
+
+            other = render_template("greeting.html", dict(context, count=1), cache=True)
+            assert "1 Apfel" in other
+            assert render.call_count == 2
+
+        with babel.force_locale("tr_TR"):
+            assert "Hallo" not in render_template("greeting.html", context, cache=True)
+            assert render.call_count == 3
+
+        render_template("greeting.html", context)
+        assert render.call_count == 4
+
+
+def test_fragment_cache_with_pluggable_backend():
+    backend = RedisStandIn()
+    b = babel.Babel(app, template_cache=backend)
+    source = (
+        '{% cache "answer", 60 %}<b>{{ gettext("Yes") }} {{ value }}</b>{% endcache %}'
+    )
+
+    with Client(app) as client:
+        with babel.force_locale("de_DE"):
+            assert render_template_string(source, value=1) == "<b>Ja 1</b>"
+            assert render_template_string(source, value=1) == "<b>Ja 1</b>"
+            assert render_template_string(source, value=2) == "<b>Ja 2</b>"
+        with babel.force_locale("tr_TR"):
+            assert render_template_string(source, value=3) == "<b>Evet 3</b>"
+    assert len(backend.store) == 3
+
+
+def test_fragment_cache_key():
+    b = babel.Babel(app)
+    env = Environment(
+        loader=DictLoader(
+            {
+                "a.html": '{% cache "side" %}a{{ n }}{% endcache %}',
+                "b.html": '{% cache "side" %}b{{ n }}{% endcache %}',
+                "vary.html": '{% cache "side", 0, n %}{{ n }} {{ m }}{% endcache %}',
+            }
+        ),
+        extensions=[FragmentCacheExtension],
+    )
+    env.fragment_cache = SimpleCache()
+
+    with Client(app) as client:
+        with babel.force_locale("de_DE"):
+            assert env.get_template("a.html").render(n=1) == "a1"
+            assert env.get_template("b.html").render(n=1) == "b1"
+            vary = env.get_template("vary.html")
+            assert vary.render(n=1, m=1) == "1 1"
+            assert vary.render(n=1, m=2) == "1 1"
+            assert vary.render(n=2, m=2) == "2 2"
+
+
+def test_simple_cache_threads():
+    cache = SimpleCache(threshold=10)
+    errors = []
+
+    def worker(offset):
+        try:
+            for i in range(2000):
+                key = str((offset + i) % 30)
+                if cache.get(key) is None:
+                    cache.set(key, key)
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(cache) <= 10
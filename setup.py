@@ -30,7 +30,10 @@ setup(
         "dev": [
             "pytest",
             "pytest-mock",
-        ]
+        ],
+        "icu": [
+            "PyICU",
+        ],
     },
     classifiers=[
         "Development Status :: 5 - Production/Stable",